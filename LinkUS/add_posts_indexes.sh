@@ -0,0 +1,19 @@
+#!/bin/bash
+
+# ==========================================
+# Add Pagination Indexes to Posts Table
+# ==========================================
+
+echo "Adding keyset pagination indexes to posts..."
+
+# Migration 0002 (migrations.py) adds them to databases created before them.
+cd "$(dirname "$0")/backend"
+./venv/bin/python migrations.py upgrade
+
+# Restart backend
+echo "Restarting backend..."
+sudo systemctl restart linkus
+
+echo "=========================================="
+echo "Posts pagination ready!"
+echo "=========================================="
@@ -0,0 +1,185 @@
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+import crud
+import models
+from catalog import LANGS, EventItem, JobItem, parse_fields
+from catalog_store import catalog_sync
+from auth import Token, create_access_token, get_admin_email, get_current_user_email, ACCESS_TOKEN_EXPIRE_MINUTES
+from database import get_async_db
+from hashing import hash_pool
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor
+from fast_json import FastJSONResponse
+from feed import post_feed
+from rate_limit import auth_slots, limit_by_ip, limit_by_user, ranking_slots
+from ranking import MAX_TOP_K, TOP_K, personalized_payload
+from search import search_index
+from write_behind import BATCHING_ENABLED, post_writer
+from schemas import User, UserCreate, PostCreate, PostResponse
+
+# --- Async Database Endpoints ---
+# Mounted instead of main.db_router when LINKUS_DB_MODE=async. Same paths,
+# parameters and responses; DB calls await the async engine rather than
+# occupying a thread-pool slot.
+router = APIRouter()
+
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    return (await db.execute(crud.user_by_email(email))).scalars().first()
+
+# --- Auth Endpoints ---
+@router.post("/api/auth/signup", status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(limit_by_ip("signup")), Depends(auth_slots)])
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    if await get_user_by_email(db, user.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+
+    hashed_password = await hash_pool.hash(user.password)
+    db.add(crud.new_user(user, hashed_password))
+    await db.commit()
+    return {"message": "User created successfully"}
+
+@router.post("/api/auth/login", response_model=Token,
+             dependencies=[Depends(limit_by_ip("login")), Depends(auth_slots)])
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await get_user_by_email(db, form_data.username)
+
+    if not user or not await hash_pool.verify(form_data.password, user.password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.email}, expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+# --- Current User ---
+async def get_current_user(email: str = Depends(get_current_user_email), db: AsyncSession = Depends(get_async_db)):
+    user = crud.user_cache.get(email)
+    if user is not None:
+        return user
+
+    db_user = await get_user_by_email(db, email)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user = crud.detached_user(db_user)
+    crud.user_cache.set(email, user)
+    return user
+
+@router.get("/api/auth/me", response_model=User)
+async def read_users_me(user: models.User = Depends(get_current_user)):
+    return FastJSONResponse(crud.user_out(user))
+
+# --- Personalized Dashboard ---
+def _personalized(user, limit, lang, fields):
+    catalog_sync.refresh()
+    return personalized_payload(user, limit, lang, parse_fields(fields, lang, EventItem, JobItem))
+
+@router.get("/api/all/personalized", dependencies=[Depends(ranking_slots)])
+async def get_personalized_content(limit: int = Query(TOP_K, ge=1, le=MAX_TOP_K),
+                                   lang: Optional[str] = Query(None, pattern="^(" + "|".join(LANGS) + ")$"),
+                                   fields: Optional[str] = None,
+                                   user: models.User = Depends(get_current_user)):
+    """Dashboard content ranked for the logged-in user (see main.get_personalized_content)"""
+    # Scoring and a catalog refresh are CPU/sync DB work: keep them off the event loop
+    payload = await run_in_threadpool(_personalized, user, limit, lang, fields)
+    return FastJSONResponse(payload, headers={"Cache-Control": "private, no-cache"})
+
+# --- Admin Endpoint ---
+@router.get("/api/admin/users", dependencies=[Depends(get_admin_email)])
+async def get_all_users(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    export: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List registered users from DB (see main.get_all_users)"""
+    if export:
+        # The export generator is sync and runs on the thread pool
+        return crud.export_users_response(export)
+    if limit is None and cursor is None:
+        rows = (await db.execute(crud.all_users())).all()
+        return FastJSONResponse([dict(row._mapping) for row in rows])
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    after = decode_cursor(cursor, str)
+    rows = (await db.execute(crud.users_after(after[0] if after else None, limit))).all()
+    return FastJSONResponse(crud.users_page(rows, limit))
+
+# --- Posts CRUD Endpoints ---
+async def load_authors(db: AsyncSession, posts) -> dict:
+    authors, ids = crud.missing_author_ids(posts)
+    if ids:
+        authors.update(crud.loaded_authors((await db.execute(crud.authors_by_id(ids))).all()))
+    return authors
+
+@router.post("/api/posts", response_model=PostResponse, dependencies=[Depends(limit_by_user("post"))])
+async def create_post(
+    post: PostCreate,
+    user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new post (requires login)"""
+    new_post = crud.new_post(post, user)
+    if BATCHING_ENABLED:
+        await db.close()  # see main.create_post
+        await post_writer.submit(new_post)
+        return FastJSONResponse(crud.post_out(new_post))
+
+    db.add(new_post)
+    await db.commit()
+    search_index.add_post(new_post)
+    # The database feed backend writes synchronously
+    await run_in_threadpool(post_feed.posts_created, [new_post])
+    return FastJSONResponse(crud.post_out(new_post))
+
+@router.get("/api/posts")
+async def get_posts(
+    category: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get posts newest-first, optionally filtered by category (see main.get_posts)"""
+    if limit is None and cursor is None:
+        rows = (await db.execute(crud.posts_newest_first(category))).all()
+        posts = crud.posts_out(rows, await load_authors(db, rows))
+        return FastJSONResponse({"posts": posts, "total": len(posts)})
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    total = (await db.execute(crud.count_posts(category))).scalar() if include_total else None
+    after = decode_cursor(cursor, str, str)
+    rows = (await db.execute(crud.posts_newest_first(category, after, limit))).all()
+    return FastJSONResponse(crud.posts_page(rows, limit, total, await load_authors(db, rows[:limit])))
+
+@router.delete("/api/posts/{post_id}", dependencies=[Depends(limit_by_user("delete"))])
+async def delete_post(
+    post_id: str,
+    email: str = Depends(get_current_user_email),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a post (only author can delete)"""
+    post = (await db.execute(crud.post_by_id(post_id))).scalars().first()
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if post.author_email != email:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    await db.delete(post)
+    await db.commit()
+    search_index.remove_post(post_id)
+    await run_in_threadpool(post_feed.post_deleted, post_id)
+    return {"message": "Post deleted"}
@@ -1,10 +1,10 @@
+import os
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
+from ttl_cache import TTLCache
 
 # --- Configuration ---
 # WARNING: In production, these should be environment variables!
@@ -13,11 +13,25 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
 # Password hashing - Using sha256_crypt (no length limit, secure)
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+# passlib and jose are imported on first use, off the worker's import path
+_pwd_context = None
+
+def password_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+    return _pwd_context
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
+# Verified tokens -> subject, so repeat calls skip jwt.decode.
+# Entries never outlive the token's own `exp`.
+TOKEN_CACHE_SIZE = int(os.environ.get("LINKUS_TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = float(os.environ.get("LINKUS_TOKEN_CACHE_TTL", "300"))
+token_cache = TTLCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL)
+
 # --- Models ---
 class Token(BaseModel):
     access_token: str
@@ -28,13 +42,23 @@ class TokenData(BaseModel):
 
 # --- Helper Functions ---
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     # sha256_crypt has no length limit
-    return pwd_context.hash(password)
+    return password_context().hash(password)
+
+# Generated temporary passwords (bulk onboarding) are random, 72+ bits: no
+# amount of rounds is needed against guessing them, so they get the minimum
+TEMPORARY_PASSWORD_ROUNDS = 1000
+
+def get_temporary_password_hash(password):
+    from passlib.hash import sha256_crypt
+    return sha256_crypt.using(rounds=TEMPORARY_PASSWORD_ROUNDS).hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -45,17 +69,43 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user_email(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+def token_subject(token: str) -> Optional[str]:
+    """The verified token's `sub`, or None for an invalid/expired token"""
+    email = token_cache.get(token)
+    if email is not None:
+        return email
+
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        return email
     except JWTError:
-        raise credentials_exception
+        return None
+    email = payload.get("sub")
+    if email is not None:
+        token_cache.set(token, email, expires_at=payload.get("exp"))
+    return email
+
+async def get_current_user_email(token: str = Depends(oauth2_scheme)):
+    email = token_subject(token)
+    if email is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return email
+
+# --- Admins ---
+# Accounts allowed on admin-only endpoints: LINKUS_ADMIN_EMAILS, comma separated
+ADMIN_EMAILS = frozenset(
+    e.strip().lower() for e in os.environ.get("LINKUS_ADMIN_EMAILS", "").split(",") if e.strip()
+)
+
+def is_admin(email: Optional[str]) -> bool:
+    return email is not None and email.lower() in ADMIN_EMAILS
+
+async def get_admin_email(email: str = Depends(get_current_user_email)):
+    if not is_admin(email):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return email
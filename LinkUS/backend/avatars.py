@@ -0,0 +1,156 @@
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+from typing import Optional
+from xml.sax.saxutils import escape
+
+from fastapi import Request, Response
+from sqlalchemy import select
+
+import models
+from database import SessionLocal
+from response_cache import etag_matches
+from ttl_cache import TTLCache
+
+# --- Initials Avatars ---
+# users.profileImage holds a short content address (AVATAR_HASH_CHARS hex
+# characters), not an image URL: the hash of what the avatar shows, i.e.
+# the user's initials and a background colour picked from their name.
+# GET /api/avatars/{hash}.svg renders it here, so pages no longer load
+# images from a third-party host.
+#
+# Rendering needs only a name that produces the hash, so nothing but the
+# users column is stored: a miss looks up any user with that profileImage
+# (ix_users_profileImage) and draws their initials. Users whose names give
+# the same initials and colour share one avatar.
+#
+# The address never changes meaning, so responses are cacheable forever
+# (Cache-Control: immutable). Rendered SVGs are kept in a per-process LRU
+# of LINKUS_AVATAR_CACHE_SIZE entries and as files in LINKUS_AVATAR_DIR,
+# shared by all workers and written once. Changing the drawing below means
+# new addresses: bump RENDER_VERSION and add a migration that rewrites
+# profileImage (see migrations.py, 0005).
+
+RENDER_VERSION = 1
+AVATAR_HASH_CHARS = 16
+CACHE_SIZE = int(os.environ.get("LINKUS_AVATAR_CACHE_SIZE", "2048"))
+AVATAR_DIR = os.path.abspath(os.environ.get("LINKUS_AVATAR_DIR", "avatars"))
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+MEDIA_TYPE = "image/svg+xml"
+
+AVATAR_HASH = re.compile(r"^[0-9a-f]{%d}$" % AVATAR_HASH_CHARS)
+# Runs of letters: digits, punctuation and emoji never become initials
+WORDS = re.compile(r"[^\W\d_]+")
+BACKGROUNDS = (
+    "#1e88e5", "#00897b", "#43a047", "#7cb342", "#f4511e", "#e53935",
+    "#d81b60", "#8e24aa", "#5e35b1", "#3949ab", "#039be5", "#6d4c41",
+)
+
+logger = logging.getLogger("linkus.avatars")
+
+
+def initials(name: Optional[str]) -> str:
+    """First letters of the first and last word; the first two of a single word"""
+    words = WORDS.findall(name or "")
+    if not words:
+        return "?"
+    if len(words) == 1:
+        return words[0][:2].upper()
+    return (words[0][0] + words[-1][0]).upper()
+
+
+def background(name: Optional[str]) -> str:
+    digest = hashlib.blake2b((name or "").encode("utf-8"), digest_size=4).digest()
+    return BACKGROUNDS[int.from_bytes(digest, "big") % len(BACKGROUNDS)]
+
+
+def avatar_hash(name: Optional[str]) -> str:
+    """The profileImage value for a user called `name`"""
+    content = f"{RENDER_VERSION}\0{initials(name)}\0{background(name)}"
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=AVATAR_HASH_CHARS // 2).hexdigest()
+
+
+def render(name: Optional[str]) -> bytes:
+    text = escape(initials(name))
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 64 64" width="64" height="64">'
+        f'<rect width="64" height="64" fill="{background(name)}"/>'
+        '<text x="50%" y="50%" dy=".35em" text-anchor="middle" fill="#fff" '
+        'font-family="-apple-system,BlinkMacSystemFont,\'Segoe UI\',\'Noto Sans KR\',sans-serif" '
+        f'font-size="26" font-weight="600">{text}</text></svg>'
+    ).encode("utf-8")
+
+
+def name_for(avatar: str) -> Optional[str]:
+    """A name drawing `avatar`, or None when no user has it"""
+    db = SessionLocal()
+    try:
+        names = db.execute(
+            select(models.User.name).where(models.User.profileImage == avatar).limit(1)
+        ).scalars().all()
+    finally:
+        db.close()
+    # Defensive: only a name that still hashes to the address draws it
+    return next((name for name in names if avatar_hash(name) == avatar), None)
+
+
+class AvatarStore:
+    def __init__(self, directory: str = AVATAR_DIR, max_entries: int = CACHE_SIZE):
+        self.directory = directory
+        # Entries never expire, only get evicted: the TTLCache as a plain LRU
+        self.memory = TTLCache(max_entries, math.inf)
+
+    def _path(self, avatar: str) -> str:
+        return os.path.join(self.directory, f"{avatar}.svg")
+
+    def cached(self, avatar: str) -> Optional[bytes]:
+        """Memory only; no I/O, safe on the event loop"""
+        return self.memory.get(avatar)
+
+    def load(self, avatar: str) -> Optional[bytes]:
+        """Memory, disk, then render from the database; None for an unknown address"""
+        if not AVATAR_HASH.match(avatar):
+            return None
+        body = self.memory.get(avatar)
+        if body is not None:
+            return body
+        try:
+            with open(self._path(avatar), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            name = name_for(avatar)
+            if name is None:
+                return None
+            body = render(name)
+            self._write(avatar, body)
+        self.memory.set(avatar, body)
+        return body
+
+    def _write(self, avatar: str, body: bytes):
+        # Workers may render the same avatar at once: each writes its own
+        # temporary file and the identical results replace one another
+        temporary = os.path.join(self.directory, f".{avatar}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "wb") as f:
+                f.write(body)
+            os.replace(temporary, self._path(avatar))
+        except OSError:
+            logger.warning("cannot write %s; serving avatars from memory only", self.directory, exc_info=True)
+
+    def clear(self):
+        self.memory.clear()
+
+
+avatar_store = AvatarStore()
+
+
+def avatar_response(request: Request, avatar: str, body: bytes) -> Response:
+    """The SVG, or a bare 304 when the client already has it"""
+    headers = {"ETag": f'"{avatar}"', "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=MEDIA_TYPE, headers=headers)
@@ -0,0 +1,10 @@
+# Backend benchmarks. Run from the backend/ directory, e.g.
+#     python -m benchmarks.login_storm --help
+import os
+import sys
+
+# Absolute, so benchmarks can chdir into a scratch --workdir (the SQLite
+# URL is relative to the cwd) and still import the backend modules
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks import BACKEND_DIR
+
+# --- Shared Benchmark Helpers ---
+
+def scratch_dir(workdir: Optional[str]) -> str:
+    """`workdir`, created if needed, or a fresh temporary directory.
+
+    Never the cwd by default: run from backend/, that holds the git-tracked
+    linkus.db, which the benchmarks would migrate and fill with rows.
+    """
+    if not workdir:
+        workdir = tempfile.mkdtemp(prefix="linkus-bench-")
+        print(f"workdir: {workdir}", file=sys.stderr)
+    os.makedirs(workdir, exist_ok=True)
+    return workdir
+
+
+def enter_workdir(workdir: Optional[str]):
+    """chdir into scratch_dir(workdir): the SQLite URL is relative to the cwd"""
+    os.chdir(scratch_dir(workdir))
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float], elapsed: Optional[float] = None, errors: int = 0) -> Dict:
+    """Latency samples are in seconds; the summary is in milliseconds"""
+    result = {
+        "count": len(samples),
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3) if samples else 0.0,
+    }
+    if elapsed:
+        result["rps"] = round(len(samples) / elapsed, 1)
+    return result
+
+
+@asynccontextmanager
+async def make_client(url: Optional[str] = None):
+    """HTTP client for a running server, or an in-process ASGI client for `main.app`"""
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            yield client
+        return
+
+    os.environ.setdefault("LINKUS_RATE_LIMIT", "0")  # see serve()
+    import main
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            yield client
+
+
+async def timed(client: httpx.AsyncClient, method: str, path: str, **kwargs):
+    start = time.perf_counter()
+    response = await client.request(method, path, **kwargs)
+    return time.perf_counter() - start, response
+
+
+async def run_load(client: httpx.AsyncClient, method: str, path: str,
+                   requests: int, concurrency: int, ok=(200, 201), **kwargs) -> Dict:
+    """Fire `requests` calls from `concurrency` workers; summary incl. RPS"""
+    samples: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            elapsed, response = await timed(client, method, path, **kwargs)
+            if response.status_code in ok:
+                samples.append(elapsed)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - start, errors)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(env: Optional[Dict[str, str]] = None, workers: int = 1, cwd: Optional[str] = None):
+    """Run `uvicorn main:app` in a subprocess and yield its base URL"""
+    port = _free_port()
+    # Benchmarks drive one IP / one user far past the rate limits
+    process_env = dict({"LINKUS_RATE_LIMIT": "0"}, **os.environ, **(env or {}))
+    process_env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, process_env.get("PYTHONPATH")]))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=cwd or BACKEND_DIR, env=process_env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                httpx.get(url + "/", timeout=1)
+                break
+            except httpx.TransportError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn failed to start")
+                time.sleep(0.2)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def write_report(report: Dict, path: Optional[str]):
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
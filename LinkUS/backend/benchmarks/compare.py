@@ -0,0 +1,43 @@
+"""Diff two benchmark reports (suite or micro) side by side.
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+# Lower is better for latencies, higher for throughput
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "rps", "best_us")
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def change(before, after) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+    before, after = load(args.before), load(args.after)
+
+    print(f"before: {before.get('commit')} {before.get('timestamp')}")
+    print(f"after:  {after.get('commit')} {after.get('timestamp')}")
+    for name, new in after.get("results", {}).items():
+        old = before.get("results", {}).get(name)
+        if old is None:
+            continue
+        print(f"\n{name}")
+        for metric in METRICS:
+            if metric in new and metric in old:
+                print(f"  {metric:<8} {old[metric]:>12} -> {new[metric]:>12}  {change(old[metric], new[metric])}")
+
+
+if __name__ == "__main__":
+    main()
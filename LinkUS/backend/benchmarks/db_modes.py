@@ -0,0 +1,61 @@
+"""Sync vs async database mode under concurrent load.
+
+    python -m benchmarks.db_modes --requests 2000 --concurrency 200
+
+Starts `uvicorn main:app` once per LINKUS_DB_MODE and drives the DB
+endpoints over HTTP. Concurrency above 40 is what exposes thread-pool
+starvation in sync mode.
+"""
+import argparse
+import asyncio
+import os
+
+import httpx
+
+from benchmarks.common import run_load, scratch_dir, serve, write_report
+
+USER = {
+    "email": "bench-modes@linkus.test", "password": "bench-password", "name": "Bench",
+    "university": "KNU", "nationality": "foreigner", "major": "CS", "year": 1,
+}
+
+
+async def drive(url: str, args) -> dict:
+    async with httpx.AsyncClient(base_url=url, timeout=120) as client:
+        await client.post("/api/auth/signup", json=USER)
+        login = await client.post("/api/auth/login", data={"username": USER["email"], "password": USER["password"]})
+        auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        results = {}
+        results["POST /api/posts"] = await run_load(
+            client, "POST", "/api/posts", args.requests // 4, args.concurrency,
+            headers=auth, json={"title": "bench", "content": "bench post", "category": "general"},
+        )
+        results["GET /api/posts?limit=20"] = await run_load(
+            client, "GET", "/api/posts?limit=20", args.requests, args.concurrency
+        )
+        results["GET /api/auth/me"] = await run_load(
+            client, "GET", "/api/auth/me", args.requests, args.concurrency, headers=auth
+        )
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--workdir", help="Directory holding linkus.db (default: a new temporary one)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    workdir = scratch_dir(args.workdir)
+    report = {"benchmark": "db_modes", "requests": args.requests, "concurrency": args.concurrency}
+    for mode in ("sync", "async"):
+        env = {"LINKUS_DB_MODE": mode, "LINKUS_HASH_WORKERS": os.environ.get("LINKUS_HASH_WORKERS", "0")}
+        with serve(env=env, cwd=workdir) as url:
+            report[mode] = asyncio.run(drive(url, args))
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Login storm: login p99 and concurrent /api/all latency.
+
+    python -m benchmarks.login_storm --logins 200 --concurrency 32
+    python -m benchmarks.login_storm --url http://127.0.0.1:8000
+
+Compare LINKUS_HASH_WORKERS=0 (hashing on the worker's own threads) with
+the default process pool to see how much the dashboard suffers.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.common import enter_workdir, make_client, summarize, timed, write_report
+
+EMAIL = "bench-storm@linkus.test"
+PASSWORD = "bench-password"
+
+
+async def ensure_user(client):
+    await client.post("/api/auth/signup", json={
+        "email": EMAIL, "password": PASSWORD, "name": "Bench", "university": "KNU",
+        "nationality": "foreigner", "major": "CS", "year": 1,
+    })
+
+
+async def run(args):
+    async with make_client(args.url) as client:
+        await ensure_user(client)
+
+        login_samples, read_samples = [], []
+        errors = {"login": 0, "login_503": 0, "read": 0}
+        queue = asyncio.Queue()
+        for _ in range(args.logins):
+            queue.put_nowait(None)
+
+        async def login_worker():
+            while not queue.empty():
+                queue.get_nowait()
+                elapsed, response = await timed(
+                    client, "POST", "/api/auth/login",
+                    data={"username": EMAIL, "password": PASSWORD},
+                )
+                if response.status_code == 200:
+                    login_samples.append(elapsed)
+                elif response.status_code == 503:
+                    errors["login_503"] += 1
+                else:
+                    errors["login"] += 1
+
+        storm_done = asyncio.Event()
+
+        async def reader():
+            while not storm_done.is_set():
+                elapsed, response = await timed(client, "GET", "/api/all?nationality=foreigner")
+                if response.status_code == 200:
+                    read_samples.append(elapsed)
+                else:
+                    errors["read"] += 1
+                await asyncio.sleep(args.read_interval)
+
+        start = time.perf_counter()
+        readers = [asyncio.create_task(reader()) for _ in range(args.readers)]
+        await asyncio.gather(*(login_worker() for _ in range(args.concurrency)))
+        storm_done.set()
+        await asyncio.gather(*readers)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "benchmark": "login_storm",
+        "target": args.url or "in-process",
+        "logins": args.logins,
+        "concurrency": args.concurrency,
+        "login": summarize(login_samples, elapsed, errors["login"]),
+        "login_rejected_503": errors["login_503"],
+        "api_all_during_storm": summarize(read_samples, elapsed, errors["read"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--read-interval", type=float, default=0.01)
+    parser.add_argument("--workdir", help="Directory holding linkus.db, in-process only (default: a new temporary one)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    if not args.url:
+        enter_workdir(args.workdir)
+    write_report(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
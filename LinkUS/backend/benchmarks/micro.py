@@ -0,0 +1,88 @@
+"""Micro-benchmarks: catalog filtering, payload building, password hashing.
+
+    python -m benchmarks.micro --output micro.json
+
+Pure in-process timings (no HTTP, no database beyond loading the bundled
+seed catalog), reported as microseconds per call.
+"""
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+
+from benchmarks import BACKEND_DIR
+from benchmarks.common import enter_workdir, write_report
+
+
+def environment() -> dict:
+    """Stamp reports so results from different commits can be told apart"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+    }
+
+
+def per_call_us(fn, number: int, repeat: int = 5) -> dict:
+    # Best of `repeat` rounds: the least disturbed by the rest of the machine
+    times = timeit.repeat(fn, number=number, repeat=repeat)
+    return {
+        "calls": number,
+        "best_us": round(min(times) / number * 1e6, 3),
+        "worst_us": round(max(times) / number * 1e6, 3),
+    }
+
+
+def run(args) -> dict:
+    import catalog_store
+    import main
+    from auth import get_password_hash, verify_password
+    from catalog import catalog
+    from migrations import upgrade
+
+    upgrade()  # seeds the catalog
+    catalog_store.catalog_sync.refresh(force=True)
+    n = args.number
+    results = {
+        "catalog.events(all)": per_call_us(lambda: catalog.events("all", None), n),
+        # A category seed/events.json has (migration 0004 seeds the catalog from it)
+        "catalog.events(foreigner, category)": per_call_us(lambda: catalog.events("foreigner", "language"), n),
+        "catalog.jobs(all)": per_call_us(lambda: catalog.jobs("all", None), n),
+        "catalog.jobs(foreigner, visa)": per_call_us(lambda: catalog.jobs("foreigner", True), n),
+        "events_payload(foreigner)": per_call_us(lambda: main.events_payload("foreigner", None), n),
+        "jobs_payload(foreigner)": per_call_us(lambda: main.jobs_payload("foreigner", None), n),
+        "all_payload(foreigner)": per_call_us(lambda: main.all_payload("foreigner"), n),
+    }
+
+    hashed = get_password_hash("bench-password")
+    results["get_password_hash"] = per_call_us(lambda: get_password_hash("bench-password"), args.hash_number, 3)
+    results["verify_password"] = per_call_us(lambda: verify_password("bench-password", hashed), args.hash_number, 3)
+    return {"benchmark": "micro", **environment(), "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", help="Directory holding linkus.db (default: a new temporary one)")
+    parser.add_argument("--number", type=int, default=10000, help="Calls per round for catalog timings")
+    parser.add_argument("--hash-number", type=int, default=10, help="Calls per round for hashing")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    enter_workdir(args.workdir)
+    write_report(run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
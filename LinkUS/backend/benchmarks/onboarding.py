@@ -0,0 +1,96 @@
+"""Bulk onboarding: a roster import vs one signup call per user.
+
+    python -m benchmarks.onboarding --workdir /tmp/bench --users 5000 --signups 10
+
+In-process (the ASGI app, migrations applied). Times --signups individual
+POST /api/auth/signup calls, then POST /api/admin/users/import with a
+roster of --users users without passwords (generated temporary ones) and
+one of --with-passwords users bringing their own (full-cost hashes).
+Emails are unique per run, so the workdir can be reused.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import enter_workdir, make_client, write_report
+from benchmarks.micro import environment
+
+ADMIN_EMAIL = "bench-admin@linkus.test"
+PASSWORD = "bench-password"
+
+
+def roster(prefix: str, n: int, with_passwords: bool) -> bytes:
+    rows = [
+        {"email": f"{prefix}{i}@linkus.test", "name": f"Exchange Student {i}", "university": "경북대학교",
+         "nationality": "foreigner", "major": "Computer Science", "year": 1 + i % 4}
+        for i in range(n)
+    ]
+    if with_passwords:
+        for row in rows:
+            row["password"] = PASSWORD
+    return json.dumps(rows).encode()
+
+
+async def bulk_import(client, headers, body: bytes) -> dict:
+    start = time.perf_counter()
+    response = await client.post("/api/admin/users/import", headers=headers,
+                                 files={"file": ("roster.json", body, "application/json")})
+    response.raise_for_status()
+    elapsed = time.perf_counter() - start
+    summary = json.loads(response.text.splitlines()[-1])["summary"]
+    return {"seconds": round(elapsed, 2), "per_user_ms": round(elapsed / max(sum(summary.values()), 1) * 1000, 2),
+            "summary": summary}
+
+
+async def run(args) -> dict:
+    run_id = str(int(time.time()))
+    async with make_client() as client:
+        await client.post("/api/auth/signup", json={
+            "email": ADMIN_EMAIL, "password": PASSWORD, "name": "Admin", "university": "KNU",
+            "nationality": "korean", "major": "CS", "year": 4,
+        })
+        token = (await client.post("/api/auth/login", data={"username": ADMIN_EMAIL, "password": PASSWORD})).json()
+        headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+        start = time.perf_counter()
+        for i in range(args.signups):
+            (await client.post("/api/auth/signup", json={
+                "email": f"signup{run_id}-{i}@linkus.test", "password": PASSWORD, "name": f"Student {i}",
+                "university": "경북대학교", "nationality": "foreigner", "major": "CS", "year": 1,
+            })).raise_for_status()
+        per_signup = (time.perf_counter() - start) / max(args.signups, 1)
+
+        results = {
+            "signup_per_user_ms": round(per_signup * 1000, 2),
+            f"signup_{args.users}_users_estimated_seconds": round(per_signup * args.users, 1),
+            "import_generated_passwords": await bulk_import(
+                client, headers, roster(f"roster{run_id}-", args.users, False)),
+        }
+        if args.with_passwords:
+            results["import_own_passwords"] = await bulk_import(
+                client, headers, roster(f"own{run_id}-", args.with_passwords, True))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", help="Directory holding linkus.db (default: a new temporary one)")
+    parser.add_argument("--users", type=int, default=5000, help="Roster size (generated passwords)")
+    parser.add_argument("--with-passwords", type=int, default=50, help="Roster size with own passwords")
+    parser.add_argument("--signups", type=int, default=10, help="Individual signups to time")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    enter_workdir(args.workdir)
+    os.environ.setdefault("LINKUS_ADMIN_EMAILS", ADMIN_EMAIL)
+
+    report = {"benchmark": "onboarding", **environment(), "users": args.users}
+    report["results"] = asyncio.run(run(args))
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
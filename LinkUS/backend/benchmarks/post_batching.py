@@ -0,0 +1,68 @@
+"""create_post throughput: one commit per post vs write-behind batching.
+
+    python -m benchmarks.post_batching --workdir /tmp/bench --requests 2000 --concurrency 64
+
+Starts `uvicorn main:app` once per mode (LINKUS_POST_BATCHING off, on, and
+on with LINKUS_POST_BATCH_WAIT=1) and hammers POST /api/posts as one
+seeded user; reports latency, RPS and how many posts actually landed.
+"""
+import argparse
+import asyncio
+import os
+
+import httpx
+
+from benchmarks import seed
+from benchmarks.common import enter_workdir, run_load, serve, write_report
+from benchmarks.micro import environment
+
+MODES = {
+    "per_post_commit": {"LINKUS_POST_BATCHING": "0"},
+    "write_behind": {"LINKUS_POST_BATCHING": "1"},
+    "group_commit": {"LINKUS_POST_BATCHING": "1", "LINKUS_POST_BATCH_WAIT": "1"},
+}
+
+
+async def drive(url: str, args) -> dict:
+    async with httpx.AsyncClient(base_url=url, timeout=120) as client:
+        login = await client.post("/api/auth/login", data={"username": seed.user_email(0), "password": seed.PASSWORD})
+        auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        before = (await client.get("/api/posts?limit=1&include_total=true")).json()["total"]
+        result = await run_load(
+            client, "POST", "/api/posts", args.requests, args.concurrency, headers=auth,
+            json={"title": "bench", "content": "bench post", "category": "general"},
+        )
+    return result, before
+
+
+def count_posts(url: str) -> int:
+    return httpx.get(url + "/api/posts?limit=1&include_total=true", timeout=60).json()["total"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", help="Directory holding linkus.db (default: a new temporary one)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    enter_workdir(args.workdir)
+
+    report = {"benchmark": "post_batching", **environment(),
+              "requests": args.requests, "concurrency": args.concurrency,
+              "seed": seed.seed(10, 0), "results": {}}
+    for mode, env in MODES.items():
+        env = dict(env, LINKUS_HASH_WORKERS=os.environ.get("LINKUS_HASH_WORKERS", "0"))
+        with serve(env=env, cwd=os.getcwd()) as url:
+            result, before = asyncio.run(drive(url, args))
+        # Counted after shutdown, so write-behind rows have been drained
+        with serve(cwd=os.getcwd()) as url:
+            result["persisted"] = count_posts(url) - before
+        report["results"][mode] = result
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
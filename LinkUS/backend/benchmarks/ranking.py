@@ -0,0 +1,78 @@
+"""Personalized ranking at catalog scale: feature build, top-K, cached top-K.
+
+    python -m benchmarks.ranking --items 50000 --output ranking.json
+
+Loads a synthetic catalog of --items events and --items jobs (the bundled
+seed items, repeated with varied titles and descriptions) straight into
+the in-memory catalog; no HTTP, no database.
+"""
+import argparse
+import os
+import random
+import time
+from types import SimpleNamespace
+
+from benchmarks.common import enter_workdir, write_report
+from benchmarks.micro import environment, per_call_us
+
+WORDS = ("python", "java", "data", "sql", "marketing", "design", "english", "translation",
+         "seoul", "daegu", "개발", "데이터", "마케팅", "디자인", "번역", "서울")
+PROFILES = {
+    "cs_foreigner": SimpleNamespace(id="p1", major="Computer Science", university="경북대학교",
+                                    year=3, nationality="foreigner"),
+    "business_korean": SimpleNamespace(id="p2", major="경영학", university="연세대학교",
+                                       year=1, nationality="korean"),
+}
+
+
+def synthetic(items, n: int, rng: random.Random) -> list:
+    return [
+        dict(item.as_dict(), id=i,
+             title=f"{item['title']} {' '.join(rng.choices(WORDS, k=2))}",
+             description=f"{item['description']} {' '.join(rng.choices(WORDS, k=8))} ref{i}")
+        for i, item in ((i, rng.choice(items)) for i in range(n))
+    ]
+
+
+def run(args) -> dict:
+    import catalog_store
+    import ranking
+    from catalog import catalog
+    from migrations import upgrade
+
+    upgrade()  # seeds the catalog
+    catalog_store.catalog_sync.refresh(force=True)
+    rng = random.Random(42)
+    catalog.load(synthetic(catalog.events(), args.items, rng), synthetic(catalog.jobs(), args.items, rng))
+
+    engine = ranking.RankingEngine()
+    started = time.perf_counter()
+    engine.refresh()
+    results = {"build_seconds": round(time.perf_counter() - started, 2), "numpy": ranking.np is not None}
+    _, models = engine._current()
+    for name, user in PROFILES.items():
+        terms = ranking.profile_terms(user)
+        results[f"top{args.k}(job, {name})"] = per_call_us(
+            lambda: models["job"].top(terms, user.nationality, args.k), args.number)
+        engine.rank(user, "job", args.k)
+        results[f"cached rank(job, {name})"] = per_call_us(lambda: engine.rank(user, "job", args.k), 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", help="Directory holding linkus.db (default: a new temporary one)")
+    parser.add_argument("--items", type=int, default=50000, help="Events and jobs each")
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--number", type=int, default=100, help="Uncached rankings per round")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    enter_workdir(args.workdir)
+    write_report({"benchmark": "ranking", **environment(), "items": args.items, "k": args.k,
+                  "results": run(args)}, args.output)
+
+
+if __name__ == "__main__":
+    main()
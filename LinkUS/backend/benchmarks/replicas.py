@@ -0,0 +1,115 @@
+"""Read/write split with two SQLite files standing in for primary and replica.
+
+    python -m benchmarks.replicas --workdir /tmp/replicas --reads 500
+
+primary.db is migrated, then copied to replica.db whenever the script
+"replicates" (sqlite3 backup), so the replica lags exactly as long as we
+want. Against the in-process app it checks:
+- a client's own post is visible right after it wrote (read-your-writes)
+- another client reads the lagging replica until the next copy
+- with the replica gone, reads fail over to the primary
+and times --reads GET /api/posts?limit=20 on the replica vs the primary.
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import time
+
+from benchmarks.common import enter_workdir, make_client, summarize, timed, write_report
+from benchmarks.micro import environment
+
+PASSWORD = "bench-password"
+
+
+def replicate():
+    source, target = sqlite3.connect("primary.db"), sqlite3.connect("replica.db")
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+
+
+async def login(client, email: str) -> dict:
+    await client.post("/api/auth/signup", json={
+        "email": email, "password": PASSWORD, "name": email.split("@")[0], "university": "KNU",
+        "nationality": "foreigner", "major": "CS", "year": 2,
+    })
+    token = (await client.post("/api/auth/login", data={"username": email, "password": PASSWORD})).json()
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+async def newest_ids(client, headers=None) -> list:
+    response = await client.get("/api/posts", params={"limit": 20}, headers=headers)
+    response.raise_for_status()
+    return [post["id"] for post in response.json()["posts"]]
+
+
+async def read_load(client, reads: int) -> dict:
+    samples = []
+    start = time.perf_counter()
+    for _ in range(reads):
+        elapsed, response = await timed(client, "GET", "/api/posts", params={"limit": 20})
+        response.raise_for_status()
+        samples.append(elapsed)
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def run(args) -> dict:
+    import database
+    from migrations import upgrade
+
+    upgrade()
+    replicate()
+    router = database.read_router
+    checks = {}
+    async with make_client() as writer:
+        headers = await login(writer, "replica-writer@linkus.test")
+        replicate()
+        post = (await writer.post("/api/posts", headers=headers, json={"title": "fresh", "content": "x"})).json()
+        checks["writer_sees_own_post"] = post["id"] in await newest_ids(writer, headers)
+
+        writer.cookies.clear()  # another browser, no recent write
+        checks["other_client_reads_lagging_replica"] = post["id"] not in await newest_ids(writer)
+        replicate()
+        checks["other_client_sees_post_after_replication"] = post["id"] in await newest_ids(writer)
+
+        before = dict(router.status())
+        replica_reads = await read_load(writer, args.reads)
+        checks["load_served_by_replica"] = router.status()["replica0_reads"] - before["replica0_reads"] == args.reads
+
+        # Replica lost: open connections closed, file gone
+        await router.replicas[0].dispose()
+        os.replace("replica.db", "replica.db.offline")
+        checks["failover_read_ok"] = post["id"] in await newest_ids(writer)
+        primary_reads = await read_load(writer, args.reads)
+        checks["replica_marked_down"] = router.status()["replica0_healthy"] == 0
+        os.replace("replica.db.offline", "replica.db")
+        status = router.status()
+
+    return {"checks": checks, "reads": status,
+            "get_posts_replica": replica_reads, "get_posts_primary_failover": primary_reads}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", help="Directory for primary.db / replica.db (default: a new temporary one)")
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    enter_workdir(args.workdir)
+    os.environ.update({
+        "LINKUS_DATABASE_URL": "sqlite:///./primary.db",
+        # Read-only, so a missing replica fails to connect instead of being created empty
+        "LINKUS_REPLICA_URLS": "sqlite:///file:replica.db?mode=ro&uri=true",
+        "LINKUS_SQLITE_JOURNAL_MODE": "DELETE",  # WAL would need replica.db-shm
+    })
+    report = {"benchmark": "replicas", **environment(), "results": asyncio.run(run(args))}
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
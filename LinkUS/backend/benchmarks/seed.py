@@ -0,0 +1,95 @@
+"""Seed a database with N users and M posts using bulk inserts.
+
+    python -m benchmarks.seed --users 10000 --posts 100000 [--workdir /tmp/bench]
+
+Every seeded user shares one password (hashed once), so login benchmarks
+can pick any of them. --workdir is the directory whose linkus.db the
+server will use, since the SQLite URL is relative to the cwd; without it a
+new temporary directory is seeded, never the cwd.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import enter_workdir
+
+BATCH_SIZE = 5000
+PASSWORD = "bench-password"
+CATEGORIES = ("general", "qna", "events", "jobs", "tips")
+UNIVERSITIES = ("KNU", "SNU", "Yonsei", "Korea Univ", "KAIST")
+WORDS = ("seoul", "visa", "campus", "intern", "hiking", "language", "exchange", "food",
+         "서울", "비자", "유학생", "인턴", "동아리", "맛집", "한국어", "장학금")
+
+
+def user_email(i: int) -> str:
+    return f"bench{i}@linkus.test"
+
+
+def seed(users: int, posts: int, seed_value: int = 42) -> dict:
+    # Imported late so --workdir takes effect before the engine connects
+    from sqlalchemy import delete, insert
+
+    import models
+    from auth import get_password_hash
+    from avatars import avatar_hash
+    from database import SessionLocal
+    from migrations import upgrade
+
+    upgrade()
+    rng = random.Random(seed_value)
+    hashed = get_password_hash(PASSWORD)
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(models.Post).where(models.Post.author_email.like("bench%@linkus.test")))
+        db.execute(delete(models.User).where(models.User.email.like("bench%@linkus.test")))
+        db.commit()
+
+        for start in range(0, users, BATCH_SIZE):
+            db.execute(insert(models.User), [
+                {
+                    "id": f"bench{i}", "email": user_email(i), "password": hashed,
+                    "name": f"Bench User {i}", "university": rng.choice(UNIVERSITIES),
+                    "nationality": rng.choice(("korean", "foreigner")), "major": "CS",
+                    "year": rng.randint(1, 4), "joinedDate": "2026-01-30",
+                    "profileImage": avatar_hash(f"Bench User {i}"),
+                }
+                for i in range(start, min(start + BATCH_SIZE, users))
+            ])
+            db.commit()
+
+        base = datetime(2026, 1, 1)
+        for start in range(0, posts, BATCH_SIZE):
+            rows = []
+            for i in range(start, min(start + BATCH_SIZE, posts)):
+                author = rng.randrange(max(users, 1))
+                rows.append({
+                    "id": f"bench-post-{i}", "author_id": f"bench{author}",
+                    "author_email": user_email(author),
+                    "title": " ".join(rng.choices(WORDS, k=5)),
+                    "content": " ".join(rng.choices(WORDS, k=40)),
+                    "category": rng.choice(CATEGORIES),
+                    "created_at": (base + timedelta(seconds=i * 37)).isoformat(),
+                })
+            db.execute(insert(models.Post), rows)
+            db.commit()
+    finally:
+        db.close()
+
+    return {"users": users, "posts": posts, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--workdir", help="Directory holding linkus.db (default: a new temporary one)")
+    args = parser.parse_args()
+    enter_workdir(args.workdir)
+    print(seed(args.users, args.posts))
+
+
+if __name__ == "__main__":
+    main()
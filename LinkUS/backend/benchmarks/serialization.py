@@ -0,0 +1,106 @@
+"""Listing serialization: ORM + jsonable_encoder vs column rows + orjson.
+
+    python -m benchmarks.serialization --workdir /tmp/bench --posts 10000
+
+Seeds --posts posts, then times building and encoding the legacy
+GET /api/posts listing (every post) in-process, stage by stage:
+- fetch: ORM entities (the old query) vs column rows (crud.posts_newest_first)
+- encode: what FastAPI does with a returned dict (jsonable_encoder, then
+  json.dumps), with a per-row Pydantic model on top (response_model), and
+  FastJSONResponse (orjson, or the stdlib fallback when it is missing)
+"""
+import argparse
+import json
+import os
+import time
+from typing import List
+
+from benchmarks import seed
+from benchmarks.common import enter_workdir, write_report
+from benchmarks.micro import environment
+
+
+def best_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return round(min(times) * 1000, 2)
+
+
+def run(args) -> dict:
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+
+    import crud
+    import models
+    from database import SessionLocal
+    from fast_json import FastJSONResponse
+    from response_cache import orjson
+    from schemas import PostResponse
+
+    def stdlib_json(data) -> bytes:
+        # starlette's JSONResponse.render
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None,
+                          separators=(",", ":")).encode("utf-8")
+
+    db = SessionLocal()
+    try:
+        def fetch_orm() -> List[dict]:
+            posts = db.execute(
+                select(models.Post).order_by(models.Post.created_at.desc(), models.Post.id.desc())
+            ).scalars().all()
+            ids = list({post.author_id for post in posts})
+            authors = {row.id: crud.Author(*row) for row in db.execute(crud.authors_by_id(ids)).all()}
+            for post in posts:
+                post.author = authors.get(post.author_id)
+            db.expunge_all()  # every call loads fresh entities, as a request would
+            return [crud.post_out(post) for post in posts]
+
+        def fetch_rows() -> List[dict]:
+            rows = db.execute(crud.posts_newest_first()).all()
+            ids = list({row.author_id for row in rows})
+            return crud.posts_out(rows, crud.loaded_authors(db.execute(crud.authors_by_id(ids)).all()))
+
+        payload = {"posts": fetch_rows(), "total": args.posts}
+        assert payload["posts"] == fetch_orm()
+        adapter = TypeAdapter(List[PostResponse])
+        body = FastJSONResponse(payload).body
+
+        results = {
+            "fetch ORM entities + post_out": best_ms(fetch_orm, args.repeat),
+            "fetch column rows + posts_out": best_ms(fetch_rows, args.repeat),
+            "encode jsonable_encoder + json": best_ms(lambda: stdlib_json(jsonable_encoder(payload)), args.repeat),
+            "encode Pydantic per row + json": best_ms(lambda: stdlib_json({
+                "posts": adapter.dump_python(adapter.validate_python(payload["posts"]), mode="json"),
+                "total": payload["total"],
+            }), args.repeat),
+            "encode FastJSONResponse": best_ms(lambda: FastJSONResponse(payload), args.repeat),
+        }
+    finally:
+        db.close()
+    return {"orjson": orjson is not None, "body_bytes": len(body), "ms": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", help="Directory holding linkus.db (default: a new temporary one)")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    enter_workdir(args.workdir)
+
+    report = {"benchmark": "serialization", **environment(), "posts": args.posts,
+              "seed": seed.seed(args.users, args.posts)}
+    report["results"] = run(args)
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
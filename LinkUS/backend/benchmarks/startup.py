@@ -0,0 +1,88 @@
+"""Worker startup: `import main` time and process start to first response.
+
+    python -m benchmarks.startup --workdir /tmp/bench --repeat 5
+
+Every measurement runs in a fresh interpreter, as a gunicorn worker boot
+or a --reload would:
+- import: wall time of `import main` (plus the slowest modules by
+  cumulative import time, from python -X importtime)
+- first request: spawning `uvicorn main:app` until a first
+  GET /api/events answers, lifespan startup included
+The database in --workdir is migrated first, as deploys do.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks import BACKEND_DIR
+from benchmarks.common import enter_workdir, serve, write_report
+from benchmarks.micro import environment
+
+IMPORT_MAIN = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+
+
+def _python(args, **kwargs) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [BACKEND_DIR, os.environ.get("PYTHONPATH")])))
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True, **kwargs)
+
+
+def import_seconds(repeat: int) -> list:
+    return [float(_python(["-c", IMPORT_MAIN]).stdout.strip().splitlines()[-1]) for _ in range(repeat)]
+
+
+def slowest_imports(top: int) -> dict:
+    """Top-level modules by cumulative import time, in ms"""
+    stderr = _python(["-X", "importtime", "-c", "import main"]).stderr
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Direct imports of main: one level below it
+        if cumulative.strip().isdigit() and len(name) - len(name.lstrip()) == 3:
+            modules[name.strip()] = int(cumulative) / 1000
+    return dict(sorted(modules.items(), key=lambda kv: -kv[1])[:top])
+
+
+def first_request_seconds(repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with serve(cwd=os.getcwd()) as url:
+            httpx.get(url + "/api/events", timeout=60).raise_for_status()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summary(samples: list) -> dict:
+    return {"best_ms": round(min(samples) * 1000, 1), "median_ms": round(statistics.median(samples) * 1000, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", help="Directory holding linkus.db (default: a new temporary one)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    enter_workdir(args.workdir)
+
+    _python([os.path.join(BACKEND_DIR, "migrations.py"), "upgrade"], cwd=os.getcwd())
+    report = {
+        "benchmark": "startup", **environment(),
+        "import_main": summary(import_seconds(args.repeat)),
+        "first_request": summary(first_request_seconds(args.repeat)),
+        "slowest_imports_ms": slowest_imports(args.top),
+    }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
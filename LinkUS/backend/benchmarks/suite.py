@@ -0,0 +1,83 @@
+"""Endpoint load test: p50/p95/p99 and RPS for the main API routes.
+
+    python -m benchmarks.suite --workdir /tmp/bench --users 1000 --posts 10000
+    python -m benchmarks.suite --workdir /tmp/bench --workers 4 --output after.json
+
+Seeds the --workdir database (skip with --no-seed), then drives the app
+in-process through an ASGI client, or with --workers N through
+`uvicorn --workers N` over real HTTP. Diff two reports with
+`python -m benchmarks.compare before.json after.json`.
+"""
+import argparse
+import asyncio
+import os
+
+from benchmarks import seed
+from benchmarks.common import enter_workdir, make_client, run_load, serve, write_report
+from benchmarks.micro import environment
+
+
+async def drive(url, args) -> dict:
+    async with make_client(url) as client:
+        credentials = {"username": seed.user_email(0), "password": seed.PASSWORD}
+        login = await client.post("/api/auth/login", data=credentials)
+        login.raise_for_status()
+        auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        n, c = args.requests, args.concurrency
+        results = {}
+        results["GET /api/all"] = await run_load(client, "GET", "/api/all?nationality=foreigner", n, c)
+        results["GET /api/posts?limit=20"] = await run_load(client, "GET", "/api/posts?limit=20", n, c)
+        results["GET /api/auth/me"] = await run_load(client, "GET", "/api/auth/me", n, c, headers=auth)
+        results["POST /api/posts"] = await run_load(
+            client, "POST", "/api/posts", n // 4 or 1, c, headers=auth,
+            json={"title": "bench", "content": "bench post", "category": "general"},
+        )
+        # Hashing-bound, so fewer requests than the read routes
+        results["POST /api/auth/login"] = await run_load(
+            client, "POST", "/api/auth/login", args.logins, c, data=credentials
+        )
+        return results
+
+
+def run(args) -> dict:
+    report = {
+        "benchmark": "suite",
+        **environment(),
+        "workers": args.workers or "in-process",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+    }
+    if not args.no_seed:
+        report["seed"] = seed.seed(args.users, args.posts)
+
+    if args.workers:
+        with serve(workers=args.workers, cwd=os.getcwd()) as url:
+            report["results"] = asyncio.run(drive(url, args))
+    else:
+        report["results"] = asyncio.run(drive(None, args))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workdir", help="Directory holding linkus.db (default: a new temporary one)")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--no-seed", action="store_true", help="Reuse the already seeded database")
+    parser.add_argument("--workers", type=int, default=0, help="uvicorn workers (0 = in-process ASGI)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    if args.no_seed and not args.workdir:
+        parser.error("--no-seed needs the --workdir that was seeded")
+    enter_workdir(args.workdir)
+    write_report(run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import sys
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+import models
+
+# --- Content Catalog (Events/Jobs) ---
+# Every filter combination the API exposes is precomputed once per catalog
+# version, so a request is a dict lookup returning an already-ordered tuple.
+# Items are __slots__ records rather than dicts (about a third of the
+# memory), with the short enumerated strings interned. Responses are built
+# through a projection, so `lang` and `fields` decide which columns ship.
+
+NATIONALITIES = (None, "foreigner", "korean")
+VISA_OPTIONS = (None, True, False)
+LANGS = ("en", "ko")
+# Text fields that have a Korean twin named <field>_ko
+BILINGUAL_FIELDS = frozenset({"title", "location", "description", "company"})
+INTERNED_FIELDS = ("type", "category", "location", "location_ko", "duration", "deadline", "date")
+
+
+class CatalogItem:
+    """Slotted catalog record; `item["x"]` and `item.get("x")` work as on a dict"""
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, values: dict):
+        for name in self.FIELDS:
+            value = values.get(name)
+            if name in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            elif name == "requirements" and value is not None:
+                value = tuple(value)
+            setattr(self, name, value)
+
+    def __getitem__(self, name: str):
+        return getattr(self, name)
+
+    def get(self, name: str, default=None):
+        return getattr(self, name, default)
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+def _item_type(name: str, model) -> type:
+    fields = tuple(c.name for c in model.__table__.columns)
+    return type(name, (CatalogItem,), {"__slots__": fields, "FIELDS": fields})
+
+
+EventItem = _item_type("EventItem", models.Event)
+JobItem = _item_type("JobItem", models.Job)
+
+
+# --- Projection ---
+class Projection:
+    """Output columns for one (item type, lang, fields) combination.
+
+    Without `lang` every column ships as stored. With `lang`, each bilingual
+    field ships once under its English name, holding that language (Korean
+    falls back to English when empty), and the *_ko columns are dropped.
+    `fields` keeps only the named output columns; `id` is always included.
+    """
+    __slots__ = ("columns",)
+
+    def __init__(self, item_type: type, lang: Optional[str] = None, fields: Optional[FrozenSet[str]] = None):
+        columns = []
+        for name in item_type.FIELDS:
+            if lang and name.endswith("_ko") and name[:-3] in BILINGUAL_FIELDS:
+                continue
+            if fields is not None and name != "id" and name not in fields:
+                continue
+            source = name + "_ko" if lang == "ko" and name in BILINGUAL_FIELDS else name
+            columns.append((name, source, name if source != name else None))
+        self.columns: Tuple[Tuple[str, str, Optional[str]], ...] = tuple(columns)
+
+    def apply(self, items: Iterable[CatalogItem]) -> List[dict]:
+        columns = self.columns
+        result = []
+        for item in items:
+            row = {}
+            for key, source, fallback in columns:
+                value = getattr(item, source)
+                if fallback is not None and not value:
+                    value = getattr(item, fallback)
+                row[key] = value
+            result.append(row)
+        return result
+
+
+def output_fields(item_type: type, lang: Optional[str]) -> FrozenSet[str]:
+    """Column names a client may ask for with `fields=`"""
+    return frozenset(key for key, _, _ in Projection(item_type, lang).columns)
+
+
+def parse_fields(fields: Optional[str], lang: Optional[str], *item_types) -> Optional[FrozenSet[str]]:
+    """`fields=a,b,c` as a set, 400 if any column is unknown to all `item_types`"""
+    if not fields:
+        return None
+    requested = frozenset(f.strip() for f in fields.split(",") if f.strip())
+    unknown = requested.difference(*(output_fields(t, lang) for t in item_types))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
+
+
+def normalize_nationality(nationality: Optional[str]) -> Optional[str]:
+    # Unknown nationalities see the unfiltered catalog, as before
+    return nationality if nationality in ("foreigner", "korean") else None
+
+
+def _for_nationality(items, nationality, sort_key=None):
+    if nationality == "foreigner":
+        result = [i for i in items if i.get("forForeigners", True)]
+        if sort_key:
+            result.sort(key=lambda x: (not x.get(sort_key, False)))
+        return result
+    if nationality == "korean":
+        return [i for i in items if i.get("forKoreans", True)]
+    return list(items)
+
+
+class _Snapshot:
+    __slots__ = ("version", "events", "jobs")
+
+    def __init__(self, version: int, events: Dict, jobs: Dict):
+        self.version = version
+        self.events = events
+        self.jobs = jobs
+
+
+class ContentCatalog:
+    def __init__(self):
+        self.version = 0
+        self._events: Tuple[CatalogItem, ...] = ()
+        self._jobs: Tuple[CatalogItem, ...] = ()
+        self._snapshot = _Snapshot(-1, {}, {})
+        self._lock = threading.Lock()
+
+    def load(self, events: Iterable[dict], jobs: Iterable[dict], version: Optional[int] = None):
+        """Replace the catalog contents; indexes are rebuilt on next read"""
+        events = tuple(EventItem(e) for e in events)
+        jobs = tuple(JobItem(j) for j in jobs)
+        with self._lock:
+            self._events = events
+            self._jobs = jobs
+            self.version = self.version + 1 if version is None else version
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot.version == self.version:
+            return snapshot
+        with self._lock:
+            if self._snapshot.version != self.version:
+                self._snapshot = self._build()
+            return self._snapshot
+
+    def _build(self) -> _Snapshot:
+        events_index = {}
+        jobs_index = {}
+        categories = {e.get("category") for e in self._events}
+
+        for nationality in NATIONALITIES:
+            base = _for_nationality(self._events, nationality, sort_key="forForeigners")
+            events_index[(nationality, None)] = tuple(base)
+            for category in categories:
+                events_index[(nationality, category)] = tuple(
+                    e for e in base if e.get("category") == category
+                )
+
+            base = _for_nationality(self._jobs, nationality, sort_key="visaSponsorship")
+            for visa in VISA_OPTIONS:
+                jobs_index[(nationality, visa)] = tuple(
+                    j for j in base if visa is None or j.get("visaSponsorship") == visa
+                )
+
+        return _Snapshot(self.version, events_index, jobs_index)
+
+    def events(self, nationality: Optional[str] = None, category: Optional[str] = None) -> Tuple[CatalogItem, ...]:
+        key = (normalize_nationality(nationality), category or None)
+        return self._current().events.get(key, ())
+
+    def jobs(self, nationality: Optional[str] = None, visa_sponsorship: Optional[bool] = None) -> Tuple[CatalogItem, ...]:
+        key = (normalize_nationality(nationality), visa_sponsorship)
+        return self._current().jobs[key]
+
+
+catalog = ContentCatalog()
@@ -0,0 +1,167 @@
+"""DB-backed storage for the events/jobs catalog.
+
+Each worker keeps an in-process snapshot (see catalog.py) and only reloads
+it when the `catalog_version` counter moved, which it checks at most once
+every LINKUS_CATALOG_REFRESH_SECONDS.
+
+Bulk import (JSON list or CSV with a header row):
+    python catalog_store.py --events events.json --jobs jobs.csv [--replace]
+"""
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import models
+from catalog import catalog
+from database import SessionLocal
+
+SEED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed")
+REFRESH_SECONDS = float(os.environ.get("LINKUS_CATALOG_REFRESH_SECONDS", "5"))
+
+MODELS = {"events": models.Event, "jobs": models.Job}
+BOOLEAN_FIELDS = {"forForeigners", "forKoreans", "visaSponsorship"}
+
+# --- Row <-> dict conversion ---
+def _columns(model):
+    return [c.name for c in model.__table__.columns]
+
+def _to_dict(row, columns: List[str]) -> dict:
+    item = {name: getattr(row, name) for name in columns}
+    if "requirements" in item:
+        item["requirements"] = json.loads(item["requirements"] or "[]")
+    return item
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+def _from_dict(model, item: dict):
+    columns = set(_columns(model))
+    values = {k: v for k, v in item.items() if k in columns and v not in (None, "")}
+    values["id"] = int(values["id"])
+    for name in BOOLEAN_FIELDS & values.keys():
+        values[name] = _parse_bool(values[name])
+    if "requirements" in values:
+        requirements = values["requirements"]
+        if isinstance(requirements, str):
+            # CSV cells hold a JSON list or a ';'-separated list
+            try:
+                requirements = json.loads(requirements)
+            except ValueError:
+                requirements = [r.strip() for r in requirements.split(";") if r.strip()]
+        values["requirements"] = json.dumps(requirements, ensure_ascii=False)
+    return model(**values)
+
+# --- Version counter ---
+def get_version(db: Session) -> int:
+    row = db.get(models.CatalogVersion, 1)
+    return row.version if row else 0
+
+def bump_version(db: Session) -> int:
+    row = db.get(models.CatalogVersion, 1)
+    if row is None:
+        row = models.CatalogVersion(id=1, version=0)
+        db.add(row)
+    row.version += 1
+    return row.version
+
+# --- Load / import ---
+def load_catalog(db: Session) -> Dict[str, list]:
+    result = {}
+    for kind, model in MODELS.items():
+        columns = _columns(model)
+        rows = db.query(model).order_by(model.id).all()
+        result[kind] = [_to_dict(row, columns) for row in rows]
+    return result
+
+def import_items(db: Session, batches: Dict[str, Iterable[dict]], replace: bool = False) -> Dict[str, int]:
+    """Upsert items by id (or replace whole tables), bumping the version once"""
+    counts = {}
+    for kind, items in batches.items():
+        model = MODELS[kind]
+        if replace:
+            db.query(model).delete()
+        counts[kind] = 0
+        for item in items:
+            db.merge(_from_dict(model, item))
+            counts[kind] += 1
+    bump_version(db)
+    db.commit()
+    return counts
+
+def read_items(path: str) -> List[dict]:
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def seed_if_empty(db: Session):
+    """Populate an empty catalog from seed/*.json (migration 0004)"""
+    if db.get(models.CatalogVersion, 1) is not None:
+        return
+    try:
+        import_items(db, {
+            kind: read_items(os.path.join(SEED_DIR, f"{kind}.json")) for kind in MODELS
+        })
+    except IntegrityError:
+        # Another worker seeded concurrently
+        db.rollback()
+
+# --- Per-worker snapshot refresh ---
+class CatalogSync:
+    def __init__(self, interval: float = REFRESH_SECONDS):
+        self.interval = interval
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False):
+        """Reload the snapshot if the DB version changed (rate-limited)"""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.interval:
+            return
+        if not self._lock.acquire(blocking=force):
+            return  # another thread is already checking
+        try:
+            self._checked_at = now
+            db = SessionLocal()
+            try:
+                version = get_version(db)
+                if force or version != catalog.version:
+                    data = load_catalog(db)
+                    catalog.load(data["events"], data["jobs"], version=version)
+            finally:
+                db.close()
+        finally:
+            self._lock.release()
+
+
+catalog_sync = CatalogSync()
+
+
+if __name__ == "__main__":
+    from migrations import upgrade
+
+    parser = argparse.ArgumentParser(description="Bulk import events/jobs into the catalog")
+    parser.add_argument("--events", help="JSON or CSV file of events")
+    parser.add_argument("--jobs", help="JSON or CSV file of jobs")
+    parser.add_argument("--replace", action="store_true", help="Delete existing rows first")
+    args = parser.parse_args()
+
+    upgrade()  # the catalog tables must exist
+    db = SessionLocal()
+    try:
+        batches = {kind: read_items(getattr(args, kind)) for kind in MODELS if getattr(args, kind)}
+        for kind, count in import_items(db, batches, replace=args.replace).items():
+            print(f"Imported {count} {kind} from {getattr(args, kind)}")
+        print(f"Catalog version is now {get_version(db)}")
+    finally:
+        db.close()
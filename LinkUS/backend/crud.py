@@ -0,0 +1,275 @@
+import csv
+import io
+import json
+import os
+import random
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_, select
+
+import models
+from avatars import avatar_hash
+from database import SessionLocal
+from pagination import encode_cursor
+from schemas import PostCreate, UserCreate
+from ttl_cache import TTLCache
+
+# --- Shared Queries ---
+# Statement builders and row factories used by both the sync endpoints in
+# main.py and the async ones in async_routes.py, so the two stay identical.
+
+# --- Users ---
+def user_by_email(email: str):
+    return select(models.User).where(models.User.email == email)
+
+def emails_taken(emails: List[str]):
+    """Which of `emails` are registered: one IN query (bulk onboarding)"""
+    return select(models.User.email).where(models.User.email.in_(emails))
+
+def all_users():
+    """Every user, as column rows"""
+    return select(*models.User.__table__.columns)
+
+# Admin listing/export: never the password hash or the avatar address
+ADMIN_USER_COLUMNS = ("id", "email", "name", "university", "nationality", "major", "year", "joinedDate")
+EXPORT_BATCH_SIZE = 1000
+
+def users_after(after_id: Optional[str], limit: int):
+    """Projected users in id order, keyset-paginated; fetches one extra row"""
+    stmt = select(*(getattr(models.User, c) for c in ADMIN_USER_COLUMNS))
+    if after_id is not None:
+        stmt = stmt.where(models.User.id > after_id)
+    return stmt.order_by(models.User.id).limit(limit + 1)
+
+def users_page(rows, limit: int) -> dict:
+    users = [dict(row._mapping) for row in rows[:limit]]
+    has_more = len(rows) > limit
+    return {
+        "users": users,
+        "next_cursor": encode_cursor(users[-1]["id"]) if has_more else None,
+        "has_more": has_more
+    }
+
+def export_users(fmt: str):
+    """NDJSON/CSV export in keyset batches, so memory stays flat at any size.
+
+    Keyset batches rather than a server-side cursor: it behaves the same on
+    every driver and never holds a long-running read open on MySQL.
+    Uses its own session because the response outlives the request's one.
+    """
+    if fmt == "csv":
+        yield ",".join(ADMIN_USER_COLUMNS) + "\n"
+    db = SessionLocal()
+    try:
+        after_id = None
+        while True:
+            rows = db.execute(users_after(after_id, EXPORT_BATCH_SIZE - 1)).all()
+            if not rows:
+                break
+            buffer = io.StringIO()
+            if fmt == "csv":
+                csv.writer(buffer, lineterminator="\n").writerows(rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(row._mapping), ensure_ascii=False) + "\n")
+            yield buffer.getvalue()
+            after_id = rows[-1].id
+            db.rollback()  # end the read transaction between batches
+    finally:
+        db.close()
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+def export_users_response(export: str) -> StreamingResponse:
+    return StreamingResponse(
+        export_users(export),
+        media_type=EXPORT_MEDIA_TYPES[export],
+        headers={"Content-Disposition": f'attachment; filename="users.{export}"'}
+    )
+
+def user_values(user: UserCreate, hashed_password: str, user_id: str) -> dict:
+    """Column values of a new user (a row for bulk inserts)"""
+    return dict(
+        id=user_id,
+        email=user.email,
+        password=hashed_password,
+        name=user.name,
+        university=user.university,
+        nationality=user.nationality,
+        major=user.major,
+        year=user.year,
+        joinedDate="2026-01-30",
+        profileImage=avatar_hash(user.name)
+    )
+
+def new_user(user: UserCreate, hashed_password: str) -> models.User:
+    # Random ID (simplification)
+    return models.User(**user_values(user, hashed_password, str(int(time.time())) + str(random.randint(100, 999))))
+
+# FastAPI resolves a dependency once per request, so every consumer of
+# get_current_user in a request shares one lookup. LINKUS_USER_CACHE_TTL > 0
+# additionally keeps a detached copy per email for that many seconds.
+USER_CACHE_TTL = float(os.environ.get("LINKUS_USER_CACHE_TTL", "0"))
+user_cache = TTLCache(1000, USER_CACHE_TTL)
+
+# schemas.User: everything but the password hash
+USER_COLUMNS = ("id", "email", "name", "university", "nationality", "major", "year", "joinedDate", "profileImage")
+
+def user_out(user: models.User) -> dict:
+    return {name: getattr(user, name) for name in USER_COLUMNS}
+
+def detached_user(db_user: models.User) -> models.User:
+    """Copy safe to share across sessions and unaffected by db.commit()"""
+    return models.User(**{c.name: getattr(db_user, c.name) for c in models.User.__table__.columns})
+
+# --- Authors ---
+# Posts store only author_id. A page of posts loads its authors with one
+# IN query (authors_by_id), and recently seen authors are cached per process
+# for LINKUS_AUTHOR_CACHE_TTL seconds, which bounds how stale a renamed
+# profile can look.
+class Author(NamedTuple):
+    id: str
+    name: str
+    university: Optional[str]
+    nationality: Optional[str]
+
+AUTHOR_CACHE_TTL = float(os.environ.get("LINKUS_AUTHOR_CACHE_TTL", "60"))
+author_cache = TTLCache(5000, AUTHOR_CACHE_TTL)
+
+def author_of(user: models.User) -> Author:
+    return Author(user.id, user.name, user.university, user.nationality)
+
+def missing_author_ids(posts: Iterable) -> Tuple[Dict[str, Author], List[str]]:
+    """Cached authors of `posts` (ORM objects or column rows), and the ids to load.
+
+    The cached ones are returned rather than looked up again at render time:
+    loading the rest may evict them from the cache meanwhile.
+    """
+    cached: Dict[str, Author] = {}
+    missing: List[str] = []
+    for author_id in {post.author_id for post in posts if post.author_id is not None}:
+        author = author_cache.get(author_id)
+        if author is None:
+            missing.append(author_id)
+        else:
+            cached[author_id] = author
+    return cached, missing
+
+def authors_by_id(ids: List[str]):
+    return select(models.User.id, models.User.name, models.User.university, models.User.nationality) \
+        .where(models.User.id.in_(ids))
+
+def loaded_authors(rows) -> Dict[str, Author]:
+    """Freshly loaded author `rows` (see authors_by_id), cached on the way"""
+    loaded: Dict[str, Author] = {}
+    for row in rows:
+        loaded[row.id] = Author(*row)
+        author_cache.set(row.id, loaded[row.id])
+    return loaded
+
+def _author_fields(author: Optional[Author]) -> dict:
+    return {
+        "author_name": author.name if author else None,
+        "author_university": author.university if author else None,
+        "author_nationality": author.nationality if author else None,
+    }
+
+POST_COLUMNS = tuple(c.name for c in models.Post.__table__.columns)
+
+def post_out(post: models.Post) -> dict:
+    """API representation: the post's columns plus its author's profile fields"""
+    return {**post_row(post), **_author_fields(post.author)}
+
+def posts_out(rows, authors: Dict[str, Author]) -> List[dict]:
+    """post_out() for the column rows of a listing (see posts_newest_first);
+    `authors` are the cached ones plus the loaded ones (missing_author_ids)"""
+    fields: Dict[Optional[str], dict] = {}
+    result = []
+    for row in rows:
+        author_id = row.author_id
+        if author_id not in fields:
+            fields[author_id] = _author_fields(authors.get(author_id))
+        post = dict(zip(POST_COLUMNS, row))
+        post.update(fields[author_id])
+        result.append(post)
+    return result
+
+# Column rows of posts held elsewhere as dicts (the search index)
+PostRow = namedtuple("PostRow", POST_COLUMNS)
+
+def post_docs_out(docs: List[dict]) -> List[dict]:
+    """posts_out() for post column dicts; opens a session only for uncached authors"""
+    rows = [PostRow(*(doc.get(name) for name in POST_COLUMNS)) for doc in docs]
+    authors, ids = missing_author_ids(rows)
+    if ids:
+        db = SessionLocal()
+        try:
+            authors.update(loaded_authors(db.execute(authors_by_id(ids)).all()))
+        finally:
+            db.close()
+    return posts_out(rows, authors)
+
+# --- Posts ---
+def new_post(post: PostCreate, user: models.User) -> models.Post:
+    author = author_of(user)
+    author_cache.set(author.id, author)
+    new = models.Post(
+        id=str(uuid.uuid4()),
+        author_id=user.id,
+        author_email=user.email,
+        title=post.title,
+        content=post.content,
+        category=post.category,
+        created_at=datetime.now().isoformat()
+    )
+    new.author = author
+    return new
+
+def post_row(post: models.Post) -> dict:
+    """Column values of `post`, e.g. for bulk inserts and feed payloads"""
+    return {name: getattr(post, name) for name in POST_COLUMNS}
+
+def post_by_id(post_id: str):
+    return select(models.Post).where(models.Post.id == post_id)
+
+def _category_filter(stmt, category: Optional[str]):
+    if category and category != "all":
+        stmt = stmt.where(models.Post.category == category)
+    return stmt
+
+def posts_newest_first(category: Optional[str] = None, after: Optional[Tuple] = None, limit: Optional[int] = None):
+    """Newest-first posts as column rows (no ORM objects to build for a
+    listing); `after` is a decoded (created_at, id) cursor"""
+    stmt = _category_filter(select(*(getattr(models.Post, c) for c in POST_COLUMNS)), category)
+    if after:
+        created_at, post_id = after
+        stmt = stmt.where(or_(
+            models.Post.created_at < created_at,
+            and_(models.Post.created_at == created_at, models.Post.id < post_id)
+        ))
+    stmt = stmt.order_by(models.Post.created_at.desc(), models.Post.id.desc())
+    if limit is not None:
+        # One extra row tells us whether another page exists
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+def count_posts(category: Optional[str] = None):
+    # Counted without the cursor filter, straight off the composite index
+    return _category_filter(select(func.count(models.Post.id)), category)
+
+def posts_page(rows, limit: int, total: Optional[int], authors: Dict[str, Author]) -> dict:
+    """Keyset page of column `rows` (see posts_out for `authors`)"""
+    posts = rows[:limit]
+    has_more = len(rows) > limit
+    next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id) if has_more else None
+    return {
+        "posts": posts_out(posts, authors),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "total": total
+    }
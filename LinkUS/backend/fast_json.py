@@ -0,0 +1,20 @@
+from fastapi.responses import JSONResponse
+
+from response_cache import dumps
+
+# --- Fast JSON Responses ---
+# A dict returned from an endpoint is validated against its response_model
+# (one Pydantic model per row) and then walked by jsonable_encoder before
+# it is encoded. Endpoints that already build plain JSON-ready dicts (e.g.
+# from column rows, see crud.posts_out) return a FastJSONResponse instead:
+# encoded straight to bytes with orjson, nothing revalidated. FastAPI does
+# not post-process a returned Response, but the route's response_model
+# still documents it, so the OpenAPI schema is unchanged.
+#
+# It is also the app's default_response_class, so every other endpoint
+# gets the faster encoder for its (still jsonable_encoder'd) result.
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from typing import AsyncIterator, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, select
+from starlette.concurrency import run_in_threadpool
+
+import crud
+import models
+from database import SessionLocal
+
+# --- Live Post Feed (GET /api/posts/stream) ---
+# create_post/delete_post publish a delta and every connected client gets it
+# over Server-Sent Events, so an open CommunityPage never re-fetches the list.
+# The SSE event id is the resume cursor: browsers send it back as
+# Last-Event-ID when they reconnect and the missed events are replayed, or,
+# when they are no longer in the history, a `reset` event asks the client
+# to reload the first page.
+#
+# Fan-out between worker processes goes through a backend:
+# - local (default): in-memory history, one process only (dev, tests)
+# - database: every worker appends to the feed_events table and polls it
+#   every LINKUS_FEED_POLL_MS; required with more than one gunicorn worker.
+
+FEED_BACKEND = os.environ.get("LINKUS_FEED_BACKEND", "local")
+FEED_HISTORY = int(os.environ.get("LINKUS_FEED_HISTORY", "1000"))  # events kept for resuming
+POLL_MS = float(os.environ.get("LINKUS_FEED_POLL_MS", "500"))
+HEARTBEAT_SECONDS = float(os.environ.get("LINKUS_FEED_HEARTBEAT_SECONDS", "15"))
+CLIENT_QUEUE_SIZE = 256  # a client this far behind is disconnected and resumes
+RETRY_MS = 3000
+
+
+class FeedMessage(NamedTuple):
+    id: int
+    kind: str  # post_created, post_deleted
+    data: str  # JSON
+
+
+# --- Backends ---
+class LocalFeedBackend:
+    poll_seconds: Optional[float] = None  # publish() wakes the broker directly
+
+    def __init__(self, history: int = FEED_HISTORY):
+        self._lock = threading.Lock()
+        self._messages: deque = deque(maxlen=history)
+        self._last_id = 0
+        self._polled_id = 0
+
+    def append(self, messages: Iterable[Tuple[str, str]]):
+        with self._lock:
+            for kind, data in messages:
+                self._last_id += 1
+                self._messages.append(FeedMessage(self._last_id, kind, data))
+
+    def last_id(self) -> int:
+        return self._last_id
+
+    def poll(self) -> List[FeedMessage]:
+        """Messages appended since the previous poll"""
+        with self._lock:
+            new = []
+            for message in reversed(self._messages):
+                if message.id <= self._polled_id:
+                    break
+                new.append(message)
+            self._polled_id = self._last_id
+        new.reverse()
+        return new
+
+    def replay(self, after_id: int) -> Optional[List[FeedMessage]]:
+        """Messages after `after_id`, or None if the history no longer covers it"""
+        with self._lock:
+            oldest = self._messages[0].id if self._messages else self._last_id + 1
+            if after_id > self._last_id or after_id < oldest - 1:
+                return None
+            return [m for m in self._messages if m.id > after_id]
+
+
+class DatabaseFeedBackend:
+    # Re-read on every poll: on MySQL, ids can commit out of order
+    OVERLAP = 100
+    PRUNE_EVERY = 100
+
+    def __init__(self, history: int = FEED_HISTORY, poll_ms: float = POLL_MS):
+        self.history = history
+        self.poll_seconds = poll_ms / 1000
+        self._polled_id: Optional[int] = None
+        self._seen: Set[int] = set()
+
+    def append(self, messages: Iterable[Tuple[str, str]]):
+        rows = [models.FeedEvent(kind=kind, data=data) for kind, data in messages]
+        db = SessionLocal()
+        try:
+            db.add_all(rows)
+            db.commit()
+            last = rows[-1].id
+            if last // self.PRUNE_EVERY != (last - len(rows)) // self.PRUNE_EVERY:
+                db.execute(delete(models.FeedEvent).where(models.FeedEvent.id <= last - self.history))
+                db.commit()
+        finally:
+            db.close()
+
+    def _after(self, db, after_id: int):
+        return db.execute(
+            select(models.FeedEvent).where(models.FeedEvent.id > after_id)
+            .order_by(models.FeedEvent.id).limit(self.history)
+        ).scalars().all()
+
+    def last_id(self) -> int:
+        db = SessionLocal()
+        try:
+            return db.execute(select(func.max(models.FeedEvent.id))).scalar() or 0
+        finally:
+            db.close()
+
+    def poll(self) -> List[FeedMessage]:
+        if self._polled_id is None:
+            # First poll: start from the current tail, the history is for replay
+            self._polled_id = self.last_id()
+            return []
+        db = SessionLocal()
+        try:
+            rows = self._after(db, max(0, self._polled_id - self.OVERLAP))
+        finally:
+            db.close()
+        new = [FeedMessage(r.id, r.kind, r.data) for r in rows if r.id not in self._seen]
+        if rows:
+            self._polled_id = max(self._polled_id, rows[-1].id)
+        floor = self._polled_id - self.OVERLAP
+        self._seen = {i for i in self._seen if i > floor} | {m.id for m in new}
+        return new
+
+    def replay(self, after_id: int) -> Optional[List[FeedMessage]]:
+        db = SessionLocal()
+        try:
+            oldest, newest = db.execute(
+                select(func.min(models.FeedEvent.id), func.max(models.FeedEvent.id))
+            ).one()
+            if newest is None or after_id > newest or after_id < oldest - 1:
+                return None
+            return [FeedMessage(r.id, r.kind, r.data) for r in self._after(db, after_id)]
+        finally:
+            db.close()
+
+
+BACKENDS = {"local": LocalFeedBackend, "database": DatabaseFeedBackend}
+
+
+# --- Broker ---
+def _sse(message: FeedMessage) -> str:
+    return f"id: {message.id}\nevent: {message.kind}\ndata: {message.data}\n\n"
+
+
+class FeedBroker:
+    def __init__(self, backend):
+        self.backend = backend
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        await run_in_threadpool(self.backend.poll)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for queue in self._subscribers:
+            queue.put_nowait(None)  # ends the stream
+        self._loop = None
+
+    # Publishing may happen on any thread (endpoints, the write-behind flusher)
+    def publish(self, messages: List[Tuple[str, dict]]):
+        self.backend.append((kind, json.dumps(data, ensure_ascii=False)) for kind, data in messages)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def posts_created(self, posts: List[models.Post]):
+        self.publish([("post_created", crud.post_out(post)) for post in posts])
+
+    def post_deleted(self, post_id: str):
+        self.publish([("post_deleted", {"id": post_id})])
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.backend.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                messages = await run_in_threadpool(self.backend.poll)
+            except Exception:
+                continue  # e.g. the DB is briefly unavailable; retry next poll
+            for queue in list(self._subscribers):
+                if queue.qsize() >= CLIENT_QUEUE_SIZE:
+                    # Too slow: end its stream; the browser reconnects and replays
+                    self._subscribers.discard(queue)
+                    queue.put_nowait(None)
+                    continue
+                for message in messages:
+                    queue.put_nowait(message)
+
+    async def stream(self, last_event_id: Optional[int]) -> AsyncIterator[str]:
+        """SSE text for one client, starting after `last_event_id`"""
+        queue: asyncio.Queue = asyncio.Queue()
+        # Subscribe before replaying, so nothing falls in between
+        self._subscribers.add(queue)
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            replayed: Set[int] = set()
+            missed = None
+            if last_event_id is not None:
+                missed = await run_in_threadpool(self.backend.replay, last_event_id)
+            if missed is None:
+                kind = "ready" if last_event_id is None else "reset"
+                yield f"id: {await run_in_threadpool(self.backend.last_id)}\nevent: {kind}\ndata: {{}}\n\n"
+            else:
+                for message in missed:
+                    replayed.add(message.id)
+                    yield _sse(message)
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"  # also keeps proxies from timing out
+                    continue
+                if message is None:
+                    return
+                # Deltas are idempotent, so an occasional repeat after a resume is harmless
+                if message.id not in replayed:
+                    yield _sse(message)
+        finally:
+            self._subscribers.discard(queue)
+
+
+post_feed = FeedBroker(BACKENDS[FEED_BACKEND]())
@@ -0,0 +1,113 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+import auth
+
+# --- Password Hashing Pool ---
+# sha256_crypt at 535,000 rounds holds the GIL for tens of milliseconds, so
+# hashing/verification runs in a separate process pool. When more than
+# LINKUS_HASH_MAX_PENDING jobs are queued, new ones are rejected with 503
+# instead of letting the backlog (and login latency) grow without bound.
+# LINKUS_HASH_WORKERS=0 hashes on the thread pool instead (dev / Windows).
+# A pool broken by a dead worker (e.g. OOM-killed) is replaced and the job
+# retried once, instead of failing every later signup/login.
+
+HASH_WORKERS = int(os.environ.get("LINKUS_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_MAX_PENDING = int(os.environ.get("LINKUS_HASH_MAX_PENDING", str(max(HASH_WORKERS, 1) * 8)))
+# Bulk hashing (hash_many) submits slices of this many passwords, at most one
+# per process at a time, so a login queued meanwhile waits for one slice only
+HASH_BULK_SLICE = int(os.environ.get("LINKUS_HASH_BULK_SLICE", "16"))
+
+
+def _hash_slice(passwords: List[Tuple[str, bool]]) -> List[str]:
+    return [
+        auth.get_temporary_password_hash(password) if temporary else auth.get_password_hash(password)
+        for password, temporary in passwords
+    ]
+
+
+class HashPool:
+    def __init__(self, workers: int = HASH_WORKERS, max_pending: int = HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a threaded server process is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, fn, *args):
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return await asyncio.wrap_future(executor.submit(fn, *args))
+            except BrokenProcessPool:
+                # Jobs only hash or verify, so running one again is harmless
+                self._discard(executor)
+                if attempt:
+                    raise
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        # Only touched from the event loop thread, so no lock is needed
+        self.pending += 1
+        try:
+            if self.workers <= 0:
+                return await run_in_threadpool(fn, *args)
+            return await self._submit(fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(auth.verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(auth.get_password_hash, password)
+
+    async def hash_many(self, passwords: List[Tuple[str, bool]]) -> List[str]:
+        """Hash (password, temporary) pairs across all processes, in order.
+
+        Waits for room in the pool rather than failing with 503, and leaves
+        some for interactive logins.
+        """
+        parallel = max(self.workers, 1)
+        slices = [passwords[i:i + HASH_BULK_SLICE] for i in range(0, len(passwords), HASH_BULK_SLICE)]
+        hashes: List[str] = []
+        for start in range(0, len(slices), parallel):
+            batch = slices[start:start + parallel]
+            while self.pending + len(batch) > max(self.max_pending - parallel, len(batch)):
+                await asyncio.sleep(0.05)
+            for result in await asyncio.gather(*(self._run(_hash_slice, s) for s in batch)):
+                hashes.extend(result)
+        return hashes
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = HashPool()
@@ -1,24 +1,81 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import APIRouter, FastAPI, Depends, File, Header, HTTPException, Query, Request, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from pydantic import BaseModel
-from typing import Optional, List
-import json
-import time 
+from typing import FrozenSet, Optional, List
+import threading
+from contextlib import asynccontextmanager
 from sqlalchemy.orm import Session
-from database import engine, get_db
+from starlette.concurrency import run_in_threadpool
+from database import (
+    ASYNC_DB, ReadYourWritesMiddleware, get_async_engine, get_db, get_engine, pool_status, read_router
+)
 import models
+import crud
+from schemas import User, UserCreate, PostCreate, PostResponse
+from catalog import (
+    LANGS, CatalogItem, EventItem, JobItem, Projection, catalog, normalize_nationality, parse_fields
+)
+from catalog_store import catalog_sync
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from response_cache import response_cache
+from fast_json import FastJSONResponse
+from hashing import hash_pool
+from rate_limit import admission_status, auth_slots, limit_by_ip, limit_by_user, ranking_slots, search_slots
+from search import search_index
+from ranking import MAX_TOP_K, TOP_K, personalized_payload, ranking_engine
+from write_behind import BATCHING_ENABLED, post_writer
+from feed import post_feed
+import metrics
+import profiling
+import migrations
+import onboarding
+from avatars import avatar_response, avatar_store
 from auth import (
-    Token, get_password_hash, verify_password, 
-    create_access_token, get_current_user_email,
+    Token, create_access_token, get_admin_email, get_current_user_email,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from datetime import timedelta
 
-# Create Tables
-models.Base.metadata.create_all(bind=engine)
+# --- Startup ---
+# Importing this module touches neither the database nor the schema: the
+# engine connects on first use and migrations run once per deploy, before
+# the workers fork (migrations.py). Each worker then only checks the schema
+# version and loads its in-process snapshots.
+def startup():
+    migrations.ensure_schema()
+    if metrics.METRICS_ENABLED or profiling.PROFILING_ENABLED:
+        replicas = [r.async_engine() if ASYNC_DB else r.engine() for r in read_router.replicas]
+        for target in (get_engine(), get_async_engine(), *replicas):
+            if target is not None and metrics.METRICS_ENABLED:
+                metrics.instrument_engine(target)
+            if target is not None and profiling.PROFILING_ENABLED:
+                profiling.instrument_engine(target)
+    # Events/Jobs catalog (database), see catalog_store.py for bulk import
+    catalog_sync.refresh(force=True)
+    search_index.sync(force=True)
+    # Personalized rankings build in the background; a ranking request
+    # arriving before it is done waits for the build (ranking.RankingEngine)
+    threading.Thread(target=ranking_engine.refresh, name="ranking-warmup", daemon=True).start()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(startup)
+    await post_feed.start()
+    if BATCHING_ENABLED:
+        post_writer.start()
+    yield
+    # Queued posts are committed before the engines go away
+    await post_writer.drain()
+    await post_feed.stop()
+    hash_pool.shutdown()
+    if get_async_engine() is not None:
+        await get_async_engine().dispose()
+    for replica in read_router.replicas:
+        await replica.dispose()
 
-app = FastAPI(title="LINK-US API", version="1.0.0")
+app = FastAPI(title="LINK-US API", version="1.0.0", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
 
 # --- Security: Hardened CORS ---
 origins = [
@@ -37,273 +94,98 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- Models (Pydantic) ---
-class UserBase(BaseModel):
-    email: str
-    name: str 
-    university: str
-    nationality: str # 'korean' or 'foreigner'
-    major: str
-    year: int
-
-class UserCreate(UserBase):
-    password: str
-
-class User(UserBase):
-    id: str
-    joinedDate: str
-    profileImage: str
-
-    class Config:
-        orm_mode = True
-
-# --- Mock Data (Events/Jobs) ---
-EVENTS = [
-    {
-        "id": 1,
-        "title": "Seoul Hiking Club - Bukhansan",
-        "title_ko": "서울 등산 클럽 - 북한산",
-        "type": "event",
-        "category": "hiking",
-        "date": "2026-02-15",
-        "location": "Bukhansan National Park",
-        "location_ko": "북한산 국립공원",
-        "description": "Join us for a scenic hike up Bukhansan! All levels welcome.",
-        "description_ko": "북한산 등산에 함께해요! 모든 수준 환영합니다.",
-        "forForeigners": True,
-        "forKoreans": True,
-        "image": "https://images.unsplash.com/photo-1551632811-561732d1e306?w=400",
-        "organizer": "Seoul Hiking Community"
-    },
-    {
-        "id": 2,
-        "title": "Korean Language Exchange",
-        "title_ko": "한국어 언어 교환",
-        "type": "event",
-        "category": "language",
-        "date": "2026-02-10",
-        "location": "Hongdae, Seoul",
-        "location_ko": "홍대, 서울",
-        "description": "Practice Korean with native speakers in a friendly cafe setting.",
-        "description_ko": "친근한 카페에서 원어민과 한국어를 연습하세요.",
-        "forForeigners": True,
-        "forKoreans": True,
-        "image": "https://images.unsplash.com/photo-1529156069898-49953e39b3ac?w=400",
-        "organizer": "Language Bridge Seoul"
-    },
-    {
-        "id": 3,
-        "title": "International Student Debate Club",
-        "title_ko": "유학생 토론 클럽",
-        "type": "event",
-        "category": "debate",
-        "date": "2026-02-20",
-        "location": "Yonsei University",
-        "location_ko": "연세대학교",
-        "description": "Weekly debate sessions on current affairs. Improve your public speaking!",
-        "description_ko": "시사 문제에 대한 주간 토론 세션. 발표 실력을 향상시키세요!",
-        "forForeigners": True,
-        "forKoreans": True,
-        "image": "https://images.unsplash.com/photo-1475721027785-f74eccf877e2?w=400",
-        "organizer": "Yonsei Debate Society"
-    },
-    {
-        "id": 4,
-        "title": "K-Pop Cover Dance Competition",
-        "title_ko": "K-Pop 커버댄스 대회",
-        "type": "competition",
-        "category": "dance",
-        "date": "2026-03-01",
-        "location": "COEX, Seoul",
-        "location_ko": "코엑스, 서울",
-        "description": "Show off your K-Pop dance skills! Prizes for top 3 teams.",
-        "description_ko": "K-Pop 댄스 실력을 뽐내세요! 상위 3팀에게 상품 수여.",
-        "forForeigners": True,
-        "forKoreans": True,
-        "image": "https://images.unsplash.com/photo-1504609813442-a8924e83f76e?w=400",
-        "organizer": "Korean Dance Federation"
-    },
-    {
-        "id": 5,
-        "title": "Art Exhibition Competition",
-        "title_ko": "미술 전시 대회",
-        "type": "competition",
-        "category": "art",
-        "date": "2026-03-15",
-        "location": "DDP, Seoul",
-        "location_ko": "동대문디자인플라자, 서울",
-        "description": "Submit your artwork for a chance to be featured in the exhibition!",
-        "description_ko": "전시회에 작품을 출품해보세요!",
-        "forForeigners": True,
-        "forKoreans": True,
-        "image": "https://images.unsplash.com/photo-1460661419201-fd4cecdf8a8b?w=400",
-        "organizer": "Seoul Art Council"
-    },
-    {
-        "id": 6,
-        "title": "Volunteer Teaching at Local School",
-        "title_ko": "지역 학교 봉사활동",
-        "type": "volunteer",
-        "category": "education",
-        "date": "Every Saturday",
-        "location": "Various Schools, Seoul",
-        "location_ko": "서울 각 학교",
-        "description": "Teach English to elementary students. Great for community service hours!",
-        "description_ko": "초등학생들에게 영어를 가르쳐주세요. 봉사시간 인정!",
-        "forForeigners": True,
-        "forKoreans": True,
-        "image": "https://images.unsplash.com/photo-1509062522246-3755977927d7?w=400",
-        "organizer": "Seoul Volunteer Network"
-    },
-]
+# --- Read Replicas (LINKUS_REPLICA_URLS) ---
+# GET requests read from a replica; see database.py
+if read_router.replicas:
+    app.add_middleware(ReadYourWritesMiddleware)
 
-JOBS = [
-    {
-        "id": 101,
-        "title": "Software Engineering Intern",
-        "title_ko": "소프트웨어 엔지니어 인턴",
-        "company": "Samsung Electronics",
-        "company_ko": "삼성전자",
-        "location": "Suwon, Korea",
-        "location_ko": "수원",
-        "type": "internship",
-        "duration": "6 months",
-        "salary": "₩2,500,000/month",
-        "description": "Join our mobile development team. Work on cutting-edge Android features.",
-        "description_ko": "모바일 개발팀에 합류하세요. 최신 안드로이드 기능 개발.",
-        "requirements": ["CS Major", "Python or Java", "English Proficiency"],
-        "forForeigners": True,
-        "forKoreans": True,
-        "visaSponsorship": True,
-        "image": "https://images.unsplash.com/photo-1560179707-f14e90ef3623?w=400",
-        "deadline": "2026-02-28"
-    },
-    {
-        "id": 102,
-        "title": "Marketing Intern (English Content)",
-        "title_ko": "마케팅 인턴 (영문 콘텐츠)",
-        "company": "Naver Corp",
-        "company_ko": "네이버",
-        "location": "Seongnam, Korea",
-        "location_ko": "성남",
-        "type": "internship",
-        "duration": "3 months",
-        "salary": "₩2,000,000/month",
-        "description": "Create English marketing content for global expansion projects.",
-        "description_ko": "글로벌 확장 프로젝트를 위한 영문 마케팅 콘텐츠 제작.",
-        "requirements": ["Marketing Major preferred", "Native English", "Creative Writing"],
-        "forForeigners": True,
-        "forKoreans": False,
-        "visaSponsorship": True,
-        "image": "https://images.unsplash.com/photo-1553877522-43269d4ea984?w=400",
-        "deadline": "2026-03-15"
-    },
-    {
-        "id": 103,
-        "title": "Data Science Intern",
-        "title_ko": "데이터 사이언스 인턴",
-        "company": "Kakao",
-        "company_ko": "카카오",
-        "location": "Pangyo, Korea",
-        "location_ko": "판교",
-        "type": "internship",
-        "duration": "6 months",
-        "salary": "₩2,800,000/month",
-        "description": "Analyze user behavior data and build ML models for recommendation systems.",
-        "description_ko": "사용자 행동 데이터 분석 및 추천 시스템 ML 모델 개발.",
-        "requirements": ["Statistics/CS Major", "Python", "SQL", "Machine Learning basics"],
-        "forForeigners": True,
-        "forKoreans": True,
-        "visaSponsorship": True,
-        "image": "https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=400",
-        "deadline": "2026-03-01"
-    },
-    {
-        "id": 104,
-        "title": "UX Design Intern",
-        "title_ko": "UX 디자인 인턴",
-        "company": "Coupang",
-        "company_ko": "쿠팡",
-        "location": "Seoul, Korea",
-        "location_ko": "서울",
-        "type": "internship",
-        "duration": "4 months",
-        "salary": "₩2,200,000/month",
-        "description": "Design user interfaces for e-commerce platform. Figma experience required.",
-        "description_ko": "이커머스 플랫폼 UI 디자인. Figma 경험 필수.",
-        "requirements": ["Design Major", "Figma/Sketch", "Portfolio required"],
-        "forForeigners": True,
-        "forKoreans": True,
-        "visaSponsorship": False,
-        "image": "https://images.unsplash.com/photo-1561070791-2526d30994b5?w=400",
-        "deadline": "2026-02-20"
-    },
-    {
-        "id": 105,
-        "title": "Translation Intern (Chinese)",
-        "title_ko": "번역 인턴 (중국어)",
-        "company": "LG Electronics",
-        "company_ko": "LG전자",
-        "location": "Seoul, Korea",
-        "location_ko": "서울",
-        "type": "internship",
-        "duration": "3 months",
-        "salary": "₩1,800,000/month",
-        "description": "Translate product manuals and marketing materials between Korean and Chinese.",
-        "description_ko": "한국어-중국어 제품 매뉴얼 및 마케팅 자료 번역.",
-        "requirements": ["Chinese Native Speaker", "TOPIK Level 5+", "Technical Writing"],
-        "forForeigners": True,
-        "forKoreans": False,
-        "visaSponsorship": True,
-        "image": "https://images.unsplash.com/photo-1486312338219-ce68d2c6f44d?w=400",
-        "deadline": "2026-02-25"
-    },
-]
+# --- Request Profiling (LINKUS_PROFILING=1) ---
+# See profiling.py; browse captures at /api/admin/profiles
+if profiling.PROFILING_ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+# --- Observability (LINKUS_METRICS=1) ---
+# Added last so it wraps everything, CORS included
+if metrics.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)  # engines are instrumented in startup()
+
+def posts_committed(posts: List[models.Post]):
+    """Make new posts searchable and push them to the live feed"""
+    for post in posts:
+        search_index.add_post(post)
+    post_feed.posts_created(posts)
+
+post_writer.on_commit.append(posts_committed)
 
 # --- API Endpoints ---
+# Endpoints that touch the database live on db_router; with LINKUS_DB_MODE=async
+# the equivalent async_routes.router is mounted instead (see bottom of file).
+db_router = APIRouter()
+
 @app.get("/")
 def root():
     return {"message": "Welcome to LINK-US API", "version": "1.0.0"}
 
+# --- Internal Endpoints ---
+# Outside /api, so the Nginx proxy never exposes them; reach via 127.0.0.1:8000
+@app.get("/internal/pool", include_in_schema=False)
+def get_pool_stats():
+    """Connection pool usage for this worker"""
+    stats = {"sync": pool_status(get_engine())}
+    if get_async_engine() is not None:
+        stats["async"] = pool_status(get_async_engine())
+    for i, replica in enumerate(read_router.replicas):
+        for target in replica.engines():
+            stats[f"replica{i}" + ("_async" if hasattr(target, "sync_engine") else "")] = pool_status(target)
+    if read_router.replicas:
+        stats["reads"] = read_router.status()
+    return stats
+
+if metrics.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        """Prometheus text exposition for this worker"""
+        gauges = {f"linkus_db_pool_{k}": v for k, v in pool_status(get_engine()).items()}
+        gauges.update({f"linkus_admission_{k}": v for k, v in admission_status().items()})
+        if read_router.replicas:
+            gauges.update({f"linkus_db_{k}": v for k, v in read_router.status().items()})
+        return PlainTextResponse(metrics.registry.render(gauges), media_type="text/plain; version=0.0.4")
+
 # --- Auth Endpoints (Database) ---
-@app.post("/api/auth/signup", status_code=status.HTTP_201_CREATED)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+# Async so that password hashing can be awaited on the process pool;
+# the (short) DB calls run on the thread pool.
+def get_user_by_email(db: Session, email: str):
+    return db.execute(crud.user_by_email(email)).scalars().first()
+
+def save_new_user(db: Session, new_user: models.User):
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+
+@db_router.post("/api/auth/signup", status_code=status.HTTP_201_CREATED,
+                dependencies=[Depends(limit_by_ip("signup")), Depends(auth_slots)])
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
     # Check if user exists
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
+    db_user = await run_in_threadpool(get_user_by_email, db, user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_pool.hash(user.password)
+    new_user = crud.new_user(user, hashed_password)
     
-    # Random ID (simplification)
-    import random
-    new_user = models.User(
-        id=str(int(time.time())) + str(random.randint(100, 999)),
-        email=user.email,
-        password=hashed_password,
-        name=user.name,
-        university=user.university,
-        nationality=user.nationality,
-        major=user.major,
-        year=user.year,
-        joinedDate="2026-01-30",
-        profileImage=f"https://api.dicebear.com/7.x/initials/svg?seed={user.name}"
-    )
-    
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(save_new_user, db, new_user)
     return {"message": "User created successfully"}
 
-@app.post("/api/auth/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+@db_router.post("/api/auth/login", response_model=Token,
+                dependencies=[Depends(limit_by_ip("login")), Depends(auth_slots)])
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     # Find user
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
+    user = await run_in_threadpool(get_user_by_email, db, form_data.username)
     
-    if not user or not verify_password(form_data.password, user.password):
+    if not user or not await hash_pool.verify(form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -316,138 +198,267 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
-@app.get("/api/auth/me", response_model=User)
-def read_users_me(email: str = Depends(get_current_user_email), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == email).first()
-    if user is None:
+# --- Current User ---
+def get_current_user(email: str = Depends(get_current_user_email), db: Session = Depends(get_db)):
+    user = crud.user_cache.get(email)
+    if user is not None:
+        return user
+
+    db_user = get_user_by_email(db, email)
+    if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
+    user = crud.detached_user(db_user)
+    crud.user_cache.set(email, user)
     return user
 
+@db_router.get("/api/auth/me", response_model=User)
+def read_users_me(user: models.User = Depends(get_current_user)):
+    return FastJSONResponse(crud.user_out(user))
+
 # --- Admin Endpoint (Database) ---
-@app.get("/api/admin/users")
-def get_all_users(db: Session = Depends(get_db)):
-    """List all registered users from DB"""
-    users = db.query(models.User).all()
-    return users
+@db_router.get("/api/admin/users", dependencies=[Depends(get_admin_email)])
+def get_all_users(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    export: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    db: Session = Depends(get_db)
+):
+    """List registered users from DB.
+
+    `limit`/`cursor` page through users by id; `export=ndjson|csv` streams
+    every user. Both return only ADMIN_USER_COLUMNS. Without any of them the
+    full user rows are returned (legacy behaviour).
+    """
+    if export:
+        return crud.export_users_response(export)
+    if limit is None and cursor is None:
+        rows = db.execute(crud.all_users()).all()
+        return FastJSONResponse([dict(row._mapping) for row in rows])
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    after = decode_cursor(cursor, str)
+    rows = db.execute(crud.users_after(after[0] if after else None, limit)).all()
+    return FastJSONResponse(crud.users_page(rows, limit))
+
+# --- Bulk Onboarding (Admin) ---
+# Not on db_router: the import uses its own sync sessions on the thread pool
+# in either DB mode (see onboarding.py)
+@app.post("/api/admin/users/import", dependencies=[Depends(get_admin_email)])
+async def import_users(file: UploadFile = File(...)):
+    """Register a roster (CSV or JSON list) of users; streams an NDJSON report.
+
+    One line per row: `created` (with a generated `password` if the row had
+    none), `exists`, `duplicate` (earlier in the file) or `invalid` (with
+    `error`), then a `summary` line with the counts.
+    """
+    rows = onboarding.read_roster(file.filename, await file.read())
+    return onboarding.import_users_response(rows)
+
+# --- Avatars ---
+# Not on db_router: a miss renders from its own sync session (see avatars.py).
+# Async so that memory hits skip the thread pool.
+@app.get("/api/avatars/{avatar}.svg")
+async def get_avatar(request: Request, avatar: str):
+    """Initials avatar for a users.profileImage address; cacheable forever"""
+    body = avatar_store.cached(avatar)
+    if body is None:
+        body = await run_in_threadpool(avatar_store.load, avatar)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+    return avatar_response(request, avatar, body)
+
+# --- Request Profiles (Admin) ---
+if profiling.PROFILING_ENABLED:
+    @app.get("/api/admin/profiles", dependencies=[Depends(get_admin_email)])
+    def list_profiles():
+        """Stored request profiles, newest first (summaries only)"""
+        return {"profiles": profiling.profile_store.summaries()}
+
+    @app.get("/api/admin/profiles/{profile_id}", dependencies=[Depends(get_admin_email)])
+    def get_profile(profile_id: str, format: str = Query("json", pattern="^(json|folded)$")):
+        """One profile: stacks, top frames and SQL as JSON, or `format=folded` for flamegraph tools"""
+        profile = profiling.profile_store.load(profile_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        if format == "folded":
+            return PlainTextResponse(profiling.folded(profile))
+        return FastJSONResponse(profile)
 
 # --- Data Endpoints ---
+# `lang=en|ko` ships each bilingual text field once, in that language;
+# `fields=a,b,c` ships only those columns (see catalog.Projection).
+LangQuery = Query(None, pattern="^(" + "|".join(LANGS) + ")$")
+
+def _key(fields: Optional[FrozenSet[str]]):
+    return tuple(sorted(fields)) if fields is not None else None
+
+def events_payload(nationality: Optional[str] = None, category: Optional[str] = None,
+                   lang: Optional[str] = None, fields: Optional[FrozenSet[str]] = None):
+    # Foreigner-friendly events come first; ordering is precomputed by the catalog
+    result = catalog.events(nationality, category)
+    return {"events": Projection(EventItem, lang, fields).apply(result), "total": len(result)}
+
+def jobs_payload(nationality: Optional[str] = None, visa_sponsorship: Optional[bool] = None,
+                 lang: Optional[str] = None, fields: Optional[FrozenSet[str]] = None):
+    # For foreigners, jobs with visa sponsorship are prioritized by the catalog
+    result = catalog.jobs(nationality, visa_sponsorship)
+    return {"jobs": Projection(JobItem, lang, fields).apply(result), "total": len(result)}
+
+def all_payload(nationality: Optional[str] = None, lang: Optional[str] = None,
+                fields: Optional[FrozenSet[str]] = None):
+    events_result = events_payload(nationality, lang=lang, fields=fields)
+    jobs_result = jobs_payload(nationality, lang=lang, fields=fields)
+    return {
+        "events": events_result["events"],
+        "jobs": jobs_result["jobs"],
+        "total_events": events_result["total"],
+        "total_jobs": jobs_result["total"]
+    }
+
+# Catalog responses are served pre-encoded with an ETag (304 on If-None-Match)
 @app.get("/api/events")
-def get_events(nationality: Optional[str] = None, category: Optional[str] = None):
+def get_events(request: Request, nationality: Optional[str] = None, category: Optional[str] = None,
+               lang: Optional[str] = LangQuery, fields: Optional[str] = None):
     """Get all events, optionally filtered by nationality preference and category"""
-    result = EVENTS.copy()
-    
-    if nationality == "foreigner":
-        result = [e for e in result if e.get("forForeigners", True)]
-        # Sort to prioritize foreigner-friendly events
-        result.sort(key=lambda x: (not x.get("forForeigners", False)), reverse=False)
-    elif nationality == "korean":
-        result = [e for e in result if e.get("forKoreans", True)]
-    
-    if category:
-        result = [e for e in result if e.get("category") == category]
-    
-    return {"events": result, "total": len(result)}
+    nationality, category = normalize_nationality(nationality), category or None
+    fields = parse_fields(fields, lang, EventItem)
+    catalog_sync.refresh()
+    return response_cache.respond(
+        request, ("events", nationality, category, lang, _key(fields)), catalog.version,
+        lambda: events_payload(nationality, category, lang, fields)
+    )
 
 @app.get("/api/jobs")
-def get_jobs(nationality: Optional[str] = None, visa_sponsorship: Optional[bool] = None):
+def get_jobs(request: Request, nationality: Optional[str] = None, visa_sponsorship: Optional[bool] = None,
+             lang: Optional[str] = LangQuery, fields: Optional[str] = None):
     """Get all jobs/internships, optionally filtered"""
-    result = JOBS.copy()
-    
-    if nationality == "foreigner":
-        result = [j for j in result if j.get("forForeigners", True)]
-        # Prioritize jobs with visa sponsorship for foreigners
-        result.sort(key=lambda x: (not x.get("visaSponsorship", False)), reverse=False)
-    elif nationality == "korean":
-        result = [j for j in result if j.get("forKoreans", True)]
-    
-    if visa_sponsorship is not None:
-        result = [j for j in result if j.get("visaSponsorship") == visa_sponsorship]
-    
-    return {"jobs": result, "total": len(result)}
+    nationality = normalize_nationality(nationality)
+    fields = parse_fields(fields, lang, JobItem)
+    catalog_sync.refresh()
+    return response_cache.respond(
+        request, ("jobs", nationality, visa_sponsorship, lang, _key(fields)), catalog.version,
+        lambda: jobs_payload(nationality, visa_sponsorship, lang, fields)
+    )
 
 @app.get("/api/all")
-def get_all_content(nationality: Optional[str] = None):
+def get_all_content(request: Request, nationality: Optional[str] = None,
+                    lang: Optional[str] = LangQuery, fields: Optional[str] = None):
     """Get all content (events + jobs) for dashboard"""
-    events_result = get_events(nationality)
-    jobs_result = get_jobs(nationality)
-    
+    nationality = normalize_nationality(nationality)
+    # A field only one kind has is simply absent from the other
+    fields = parse_fields(fields, lang, EventItem, JobItem)
+    catalog_sync.refresh()
+    return response_cache.respond(
+        request, ("all", nationality, lang, _key(fields)), catalog.version,
+        lambda: all_payload(nationality, lang, fields)
+    )
+
+# Ranked for the caller's profile (see ranking.py); per-user, so never shared-cached
+@db_router.get("/api/all/personalized", dependencies=[Depends(ranking_slots)])
+def get_personalized_content(limit: int = Query(TOP_K, ge=1, le=MAX_TOP_K),
+                             lang: Optional[str] = LangQuery, fields: Optional[str] = None,
+                             user: models.User = Depends(get_current_user)):
+    """Dashboard content ranked by the logged-in user's major, university and year"""
+    fields = parse_fields(fields, lang, EventItem, JobItem)
+    catalog_sync.refresh()
+    return FastJSONResponse(personalized_payload(user, limit, lang, fields),
+                            headers={"Cache-Control": "private, no-cache"})
+
+# --- Search ---
+@app.get("/api/search", dependencies=[Depends(search_slots)])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, pattern="^(post|event|job)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """Ranked full-text search over posts, events and jobs (English + Korean)"""
+    catalog_sync.refresh()
+    search_index.sync()
+    offset = decode_cursor(cursor, int)[0] if cursor else 0
+    if offset < 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    total, hits = search_index.search(q, kind=type, limit=limit, offset=offset)
+    next_offset = offset + len(hits)
+    # Post hits get their author's fields, as in GET /api/posts
+    posts = iter(crud.post_docs_out([doc for _, kind, doc in hits if kind == "post"]))
     return {
-        "events": events_result["events"],
-        "jobs": jobs_result["jobs"],
-        "total_events": events_result["total"],
-        "total_jobs": jobs_result["total"]
+        "results": [
+            {"type": kind, "score": score,
+             "item": next(posts) if kind == "post" else doc.as_dict() if isinstance(doc, CatalogItem) else doc}
+            for score, kind, doc in hits
+        ],
+        "total": total,
+        "next_cursor": encode_cursor(next_offset) if next_offset < total else None
     }
 
 # --- Posts CRUD Endpoints ---
-class PostCreate(BaseModel):
-    title: str
-    content: str
-    category: str = "general"
-
-class PostResponse(BaseModel):
-    id: str
-    author_email: str
-    author_name: str
-    author_university: Optional[str] = None
-    author_nationality: Optional[str] = None
-    title: str
-    content: str
-    category: str
-    created_at: str
-
-    class Config:
-        orm_mode = True
-
-@app.post("/api/posts", response_model=PostResponse)
-def create_post(
+def load_authors(db: Session, posts) -> dict:
+    """Authors of `posts` by id: cached ones, plus one IN query for the rest"""
+    authors, ids = crud.missing_author_ids(posts)
+    if ids:
+        authors.update(crud.loaded_authors(db.execute(crud.authors_by_id(ids)).all()))
+    return authors
+
+def save_new_post(db: Session, new_post: models.Post):
+    db.add(new_post)
+    db.commit()
+    db.refresh(new_post)
+    posts_committed([new_post])
+
+@db_router.post("/api/posts", response_model=PostResponse, dependencies=[Depends(limit_by_user("post"))])
+async def create_post(
     post: PostCreate,
-    email: str = Depends(get_current_user_email),
+    user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new post (requires login)"""
-    user = db.query(models.User).filter(models.User.email == email).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    import uuid
-    from datetime import datetime
-    
-    new_post = models.Post(
-        id=str(uuid.uuid4()),
-        author_email=email,
-        author_name=user.name,
-        author_university=user.university,
-        author_nationality=user.nationality,
-        title=post.title,
-        content=post.content,
-        category=post.category,
-        created_at=datetime.now().isoformat()
-    )
-    
-    db.add(new_post)
-    db.commit()
-    db.refresh(new_post)
-    return new_post
+    new_post = crud.new_post(post, user)
 
-@app.get("/api/posts")
-def get_posts(category: Optional[str] = None, db: Session = Depends(get_db)):
-    """Get all posts, optionally filtered by category"""
-    query = db.query(models.Post).order_by(models.Post.created_at.desc())
-    
-    if category and category != "all":
-        query = query.filter(models.Post.category == category)
-    
-    posts = query.all()
-    return {"posts": posts, "total": len(posts)}
+    if BATCHING_ENABLED:
+        # id/created_at are already set; the row is committed in a batch.
+        # Hand the connection back first, as the flusher may need it. Not via
+        # run_in_threadpool: its threads may all be blocked waiting on the pool.
+        db.close()
+        await post_writer.submit(new_post)
+        return FastJSONResponse(crud.post_out(new_post))
+
+    await run_in_threadpool(save_new_post, db, new_post)
+    return FastJSONResponse(crud.post_out(new_post))
 
-@app.delete("/api/posts/{post_id}")
+@db_router.get("/api/posts")
+def get_posts(
+    category: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Get posts newest-first, optionally filtered by category.
+
+    Without `limit`/`cursor` every post is returned (legacy behaviour).
+    With `limit`, a keyset page is returned together with `next_cursor`,
+    which is passed back as `cursor` to fetch the following page.
+    """
+    if limit is None and cursor is None:
+        rows = db.execute(crud.posts_newest_first(category)).all()
+        posts = crud.posts_out(rows, load_authors(db, rows))
+        return FastJSONResponse({"posts": posts, "total": len(posts)})
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    total = db.execute(crud.count_posts(category)).scalar() if include_total else None
+    after = decode_cursor(cursor, str, str)
+    rows = db.execute(crud.posts_newest_first(category, after, limit)).all()
+    return FastJSONResponse(crud.posts_page(rows, limit, total, load_authors(db, rows[:limit])))
+
+@db_router.delete("/api/posts/{post_id}", dependencies=[Depends(limit_by_user("delete"))])
 def delete_post(
     post_id: str,
     email: str = Depends(get_current_user_email),
     db: Session = Depends(get_db)
 ):
     """Delete a post (only author can delete)"""
-    post = db.query(models.Post).filter(models.Post.id == post_id).first()
+    post = db.execute(crud.post_by_id(post_id)).scalars().first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     if post.author_email != email:
@@ -455,8 +466,37 @@ def delete_post(
     
     db.delete(post)
     db.commit()
+    search_index.remove_post(post_id)
+    post_feed.post_deleted(post_id)
     return {"message": "Post deleted"}
 
+# --- Live Post Feed ---
+@app.get("/api/posts/stream")
+async def stream_posts(
+    last_event_id: Optional[str] = Header(None),
+    cursor: Optional[str] = Query(None, description="Last event id, for clients that cannot set headers")
+):
+    """post_created / post_deleted deltas as Server-Sent Events.
+
+    Reconnecting browsers send Last-Event-ID and get the events they missed;
+    see feed.py.
+    """
+    resume = last_event_id or cursor
+    # A malformed cursor still means "the client had state": reset it
+    after = (int(resume) if resume.isdigit() else -1) if resume else None
+    return StreamingResponse(
+        post_feed.stream(after),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: Nginx must pass events through as they come
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+if ASYNC_DB:
+    from async_routes import router as async_db_router
+    app.include_router(async_db_router)
+else:
+    app.include_router(db_router)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,190 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+# --- Request / DB Instrumentation ---
+# Off by default. With LINKUS_METRICS=1 the ASGI middleware and the
+# SQLAlchemy cursor hooks are installed; otherwise nothing is registered at
+# all, so the disabled path costs nothing per request or per query.
+# Numbers are per worker process (Prometheus labels each scrape target).
+
+METRICS_ENABLED = os.environ.get("LINKUS_METRICS", "0").lower() in ("1", "true", "yes")
+SLOW_REQUEST_MS = float(os.environ.get("LINKUS_SLOW_REQUEST_MS", "0"))  # 0 = off
+N_PLUS_ONE_THRESHOLD = int(os.environ.get("LINKUS_N_PLUS_ONE_THRESHOLD", "5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+logger = logging.getLogger("linkus.slow")
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestStats:
+    """Queries issued while serving one request (carried in a ContextVar)"""
+    __slots__ = ("queries", "db_time", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+
+    def repeated(self):
+        return {sql: n for sql, n in self.statements.items() if n >= N_PLUS_ONE_THRESHOLD}
+
+
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "linkus_request_stats", default=None
+)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[tuple, Histogram] = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.response_size: Dict[tuple, Histogram] = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+        self.responses: Counter = Counter()
+        self.db_queries: Counter = Counter()
+        self.db_time: Counter = Counter()
+        self.n_plus_one: Counter = Counter()
+        self.in_flight = 0
+
+    def record(self, method: str, route: str, status: int, seconds: float, size: int, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            self.latency[key].observe(seconds)
+            self.response_size[key].observe(size)
+            self.responses[(method, route, str(status))] += 1
+            self.db_queries[key] += stats.queries
+            self.db_time[key] += stats.db_time
+            if stats.repeated():
+                self.n_plus_one[key] += 1
+
+    def render(self, extra_gauges: Optional[Dict[str, float]] = None) -> str:
+        lines = []
+
+        def histogram(name, help_text, data):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), hist in sorted(data.items()):
+                labels = f'method="{method}",route="{route}"'
+                cumulative = 0
+                for bound, count in zip(hist.buckets + ("+Inf",), hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        def counter(name, help_text, data, label_names=("method", "route")):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(data.items()):
+                labels = ",".join(f'{n}="{v}"' for n, v in zip(label_names, key))
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        with self._lock:
+            histogram("linkus_request_duration_seconds", "Request latency", self.latency)
+            histogram("linkus_response_size_bytes", "Response body size", self.response_size)
+            counter("linkus_responses_total", "Responses by status", self.responses, ("method", "route", "status"))
+            counter("linkus_db_queries_total", "SQL statements executed", self.db_queries)
+            counter("linkus_db_query_seconds_total", "Time spent in SQL", self.db_time)
+            counter("linkus_n_plus_one_requests_total", "Requests repeating one statement "
+                    f">= {N_PLUS_ONE_THRESHOLD} times", self.n_plus_one)
+            lines.append("# HELP linkus_requests_in_flight Requests being served")
+            lines.append("# TYPE linkus_requests_in_flight gauge")
+            lines.append(f"linkus_requests_in_flight {self.in_flight}")
+        for name, value in (extra_gauges or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# --- SQLAlchemy hooks ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        conn.info["linkus_query_start"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("linkus_query_start", None)
+    stats = _request_stats.get()
+    if started is None or stats is None:
+        return
+    stats.queries += 1
+    stats.db_time += time.perf_counter() - started
+    stats.statements[statement] += 1
+
+def instrument_engine(engine):
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- ASGI middleware ---
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        registry.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            registry.in_flight -= 1
+            _request_stats.reset(token)
+            # Route template keeps label cardinality bounded (/api/posts/{post_id})
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            registry.record(scope["method"], route, status_code, elapsed, size, stats)
+            if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+                _log_slow(scope, route, status_code, elapsed, stats)
+
+
+def _log_slow(scope, route, status_code, elapsed, stats: RequestStats):
+    top = stats.statements.most_common(5)
+    breakdown = "; ".join(f"{n}x {' '.join(sql.split())[:120]}" for sql, n in top)
+    logger.warning(
+        "slow request %s %s (%s) %d %.1fms queries=%d db=%.1fms n_plus_one=%s | %s",
+        scope["method"], scope["path"], route, status_code, elapsed * 1000,
+        stats.queries, stats.db_time * 1000, bool(stats.repeated()), breakdown,
+    )
@@ -0,0 +1,232 @@
+"""Versioned schema migrations.
+
+    python migrations.py upgrade   # apply pending migrations
+    python migrations.py status    # list them; exits 1 while any is pending
+
+Deploys run `upgrade` once before the workers fork (ExecStartPre in
+fix_workers.sh), so workers never race each other on DDL; a starting worker
+only reads the applied versions and refuses to serve an older schema
+(LINKUS_AUTO_MIGRATE=0). Locally LINKUS_AUTO_MIGRATE defaults to 1 and the
+app applies pending migrations itself on startup.
+
+Adding a schema change: append a function decorated with @migration(<next
+version>, "<what it does>"). It runs on a Connection inside a transaction
+and must be a no-op when its change is already there: 0001 creates every
+missing table in its current shape, and older databases may have had the
+change applied by hand with the shell scripts these replace.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import (
+    Column, Float, Integer, MetaData, String, Table, Text, bindparam, inspect, insert, select, text, update
+)
+
+import models
+from database import get_engine
+
+AUTO_MIGRATE = os.environ.get("LINKUS_AUTO_MIGRATE", "1").lower() in ("1", "true", "yes")
+LOCK_NAME = "linkus_migrations"
+LOCK_TIMEOUT = int(os.environ.get("LINKUS_MIGRATION_LOCK_TIMEOUT", "60"))
+AVATAR_BATCH_SIZE = 1000
+
+# Bookkeeping lives outside models.Base, so 0001 never creates it by accident
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", Float, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, name: str):
+    def register(upgrade):
+        assert all(m.version < version for m in MIGRATIONS), "migrations must be declared in order"
+        MIGRATIONS.append(Migration(version, name, upgrade))
+        return upgrade
+    return register
+
+
+def _columns(conn, table: str) -> set:
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def _indexes(conn, table: str) -> set:
+    return {ix["name"] for ix in inspect(conn).get_indexes(table)}
+
+
+# Author fields posts used to copy (0003). Posts whose author was deleted
+# keep theirs here: users.id cannot be resolved for them any more
+orphaned_post_authors = Table(
+    "orphaned_post_authors", MetaData(),
+    Column("post_id", String(50), primary_key=True),
+    Column("author_email", String(100)),
+    Column("author_name", String(100)),
+    Column("author_university", String(100)),
+    Column("author_nationality", String(50)),
+)
+AUTHOR_SNAPSHOT_COLUMNS = ("author_name", "author_university", "author_nationality")
+
+
+# --- Migrations ---
+@migration(1, "create missing tables")
+def create_tables(conn):
+    models.Base.metadata.create_all(conn)
+
+
+@migration(2, "posts keyset pagination indexes")  # was add_posts_indexes.sh
+def posts_pagination_indexes(conn):
+    existing = _indexes(conn, "posts")
+    for index in models.Post.__table__.indexes:
+        if index.name in ("ix_posts_category_created_at_id", "ix_posts_created_at_id") \
+                and index.name not in existing:
+            index.create(conn)
+
+
+@migration(3, "posts reference their author by users.id")  # was migrate_post_authors.sh
+def posts_author_id(conn):
+    # Posts whose author no longer exists get a NULL author_id
+    columns = _columns(conn, "posts")
+    if "author_id" not in columns:
+        conn.execute(text("ALTER TABLE posts ADD COLUMN author_id VARCHAR(50) NULL"))
+        conn.execute(text(
+            "UPDATE posts SET author_id = (SELECT users.id FROM users WHERE users.email = posts.author_email)"
+        ))
+    if "ix_posts_author_id" not in _indexes(conn, "posts"):
+        conn.execute(text("CREATE INDEX ix_posts_author_id ON posts (author_id)"))
+    # SQLite cannot add a constraint to an existing table; MySQL can
+    if conn.dialect.name == "mysql" and not any(
+        fk["referred_table"] == "users" for fk in inspect(conn).get_foreign_keys("posts")
+    ):
+        conn.execute(text(
+            "ALTER TABLE posts ADD CONSTRAINT fk_posts_author_id FOREIGN KEY (author_id) REFERENCES users (id)"
+        ))
+    snapshot = [name for name in AUTHOR_SNAPSHOT_COLUMNS if name in columns]
+    if snapshot:
+        # The copied fields are their only record of who wrote them
+        orphans = conn.execute(text(
+            f"SELECT id AS post_id, author_email, {', '.join(snapshot)} FROM posts WHERE author_id IS NULL"
+        )).mappings().all()
+        if orphans:
+            orphaned_post_authors.create(conn, checkfirst=True)
+            conn.execute(insert(orphaned_post_authors), [dict(row) for row in orphans])
+    for name in snapshot:
+        conn.execute(text(f"ALTER TABLE posts DROP COLUMN {name}"))
+
+
+@migration(4, "seed the events/jobs catalog")
+def seed_catalog(conn):
+    from sqlalchemy.orm import Session
+
+    from catalog_store import seed_if_empty
+
+    # Joins the migration's transaction; its commit() only releases a savepoint
+    seed_if_empty(Session(bind=conn, join_transaction_mode="create_savepoint"))
+
+
+@migration(5, "users.profileImage holds an avatar address")
+def users_avatar_address(conn):
+    # Was a dicebear URL per user; now the hash GET /api/avatars/{hash}.svg serves
+    from avatars import avatar_hash
+
+    users = models.User.__table__
+    stale = [
+        {"user_id": row.id, "avatar": avatar_hash(row.name)}
+        for row in conn.execute(select(users.c.id, users.c.name, users.c.profileImage))
+        if row.profileImage != avatar_hash(row.name)
+    ]
+    stmt = update(users).where(users.c.id == bindparam("user_id")).values(profileImage=bindparam("avatar"))
+    for start in range(0, len(stale), AVATAR_BATCH_SIZE):
+        conn.execute(stmt, stale[start:start + AVATAR_BATCH_SIZE])
+    # MySQL cannot index a TEXT column; SQLite does not mind either type
+    if conn.dialect.name == "mysql" and any(
+        c["name"] == "profileImage" and isinstance(c["type"], Text) for c in inspect(conn).get_columns("users")
+    ):
+        conn.execute(text("ALTER TABLE users MODIFY profileImage VARCHAR(32) NULL"))
+    if "ix_users_profileImage" not in _indexes(conn, "users"):
+        next(ix for ix in users.indexes if ix.name == "ix_users_profileImage").create(conn)
+
+
+# --- Runner ---
+def applied_versions(conn) -> set:
+    if not inspect(conn).has_table(schema_migrations.name):
+        return set()
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending(conn) -> List[Migration]:
+    done = applied_versions(conn)
+    return [m for m in MIGRATIONS if m.version not in done]
+
+
+def upgrade(engine=None) -> List[Migration]:
+    """Apply pending migrations in order, each in its own transaction"""
+    engine = engine or get_engine()
+    applied = []
+    with engine.connect() as conn:
+        # Concurrent upgrades (two deploys, several hosts) take turns on MySQL;
+        # SQLite serializes the writers itself
+        if conn.dialect.name == "mysql":
+            if not conn.execute(text("SELECT GET_LOCK(:name, :timeout)"),
+                                {"name": LOCK_NAME, "timeout": LOCK_TIMEOUT}).scalar():
+                raise RuntimeError(f"Another migration holds the {LOCK_NAME} lock")
+        try:
+            schema_migrations.create(conn, checkfirst=True)
+            conn.commit()
+            for m in pending(conn):
+                conn.rollback()  # end the read transaction pending() began
+                with conn.begin():
+                    m.upgrade(conn)
+                    conn.execute(insert(schema_migrations).values(
+                        version=m.version, name=m.name, applied_at=time.time()
+                    ))
+                applied.append(m)
+        finally:
+            if conn.dialect.name == "mysql":
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+    return applied
+
+
+def ensure_schema():
+    """Startup check: migrate (LINKUS_AUTO_MIGRATE=1) or fail on an old schema"""
+    with get_engine().connect() as conn:
+        behind = pending(conn)
+    if not behind:
+        return
+    if AUTO_MIGRATE:
+        upgrade()
+        return
+    raise RuntimeError(
+        "Database schema is behind (pending: " + ", ".join(f"{m.version:04d}" for m in behind)
+        + "); run `python migrations.py upgrade` first"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Versioned schema migrations")
+    parser.add_argument("command", choices=("upgrade", "status"))
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        applied = upgrade()
+        for m in applied:
+            print(f"Applied {m.version:04d} {m.name}")
+        print(f"Database is up to date ({len(applied)} applied).")
+    else:
+        with get_engine().connect() as conn:
+            done = applied_versions(conn)
+        for m in MIGRATIONS:
+            print(f"{m.version:04d} {'applied' if m.version in done else 'pending'}  {m.name}")
+        sys.exit(0 if all(m.version in done for m in MIGRATIONS) else 1)
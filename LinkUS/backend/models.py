@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Boolean, Column, Float, ForeignKey, Index, Integer, String, Text
 from database import Base
 
 class User(Base):
@@ -13,18 +13,95 @@ class User(Base):
     major = Column(String(100))
     year = Column(Integer)
     joinedDate = Column(String(50))
-    profileImage = Column(Text)
+    profileImage = Column(String(32), index=True)  # avatar address, see avatars.py
 
 
 class Post(Base):
     __tablename__ = "posts"
 
     id = Column(String(50), primary_key=True, index=True)
-    author_email = Column(String(100), index=True)
-    author_name = Column(String(100))
-    author_university = Column(String(100))
-    author_nationality = Column(String(50))
+    author_id = Column(String(50), ForeignKey("users.id"), index=True)
+    author_email = Column(String(100), index=True)  # kept: delete checks the token's email
     title = Column(String(200))
     content = Column(Text)
     category = Column(String(50))  # general, qna, events, jobs, tips
     created_at = Column(String(50))
+
+    # Keyset pagination: newest-first feed, per category and across all
+    __table_args__ = (
+        Index("ix_posts_category_created_at_id", "category", "created_at", "id"),
+        Index("ix_posts_created_at_id", "created_at", "id"),
+    )
+
+    # Not a column: the Author snapshot crud.post_out() renders, set by
+    # crud.new_post(). Listings are column rows instead; crud.posts_out()
+    # takes their authors from the cache or one IN query (missing_author_ids).
+    author = None
+
+
+class Event(Base):
+    __tablename__ = "events"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(200))
+    title_ko = Column(String(200))
+    type = Column(String(50))  # event, competition, volunteer
+    category = Column(String(50), index=True)
+    date = Column(String(50))
+    location = Column(String(200))
+    location_ko = Column(String(200))
+    description = Column(Text)
+    description_ko = Column(Text)
+    forForeigners = Column(Boolean, default=True, index=True)
+    forKoreans = Column(Boolean, default=True, index=True)
+    image = Column(Text)
+    organizer = Column(String(200))
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(200))
+    title_ko = Column(String(200))
+    company = Column(String(200))
+    company_ko = Column(String(200))
+    location = Column(String(200))
+    location_ko = Column(String(200))
+    type = Column(String(50), index=True)  # internship, part-time, ...
+    duration = Column(String(50))
+    salary = Column(String(100))
+    description = Column(Text)
+    description_ko = Column(Text)
+    requirements = Column(Text)  # JSON-encoded list of strings
+    forForeigners = Column(Boolean, default=True, index=True)
+    forKoreans = Column(Boolean, default=True, index=True)
+    visaSponsorship = Column(Boolean, default=False, index=True)
+    image = Column(Text)
+    deadline = Column(String(50))
+
+
+class CatalogVersion(Base):
+    """Single-row counter bumped on every catalog import"""
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class FeedEvent(Base):
+    """Post created/deleted deltas shared by all workers (see feed.py)"""
+    __tablename__ = "feed_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(20))  # post_created, post_deleted
+    data = Column(Text)  # JSON payload
+
+
+class RateLimitBucket(Base):
+    """Token bucket shared by all workers (see rate_limit.py)"""
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String(255), primary_key=True)  # <rule>:<ip or email>
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False, index=True)  # unix time
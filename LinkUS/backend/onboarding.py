@@ -0,0 +1,167 @@
+"""Bulk user onboarding: a university's roster imported in one request.
+
+    curl -H "Authorization: Bearer $ADMIN_TOKEN" -F file=@roster.csv \
+        http://127.0.0.1:8000/api/admin/users/import
+
+The roster is a CSV with a header row or a JSON list of objects, with the
+signup fields (email, name, university, nationality, major, year) and an
+optional password. Rows without one get a generated temporary password,
+returned in their report line.
+
+Rows are processed in chunks of LINKUS_ONBOARD_CHUNK_SIZE: one IN query for
+the emails already taken, passwords hashed across the hash pool's processes
+(hashing.HashPool.hash_many), then one executemany INSERT per chunk,
+committed on its own. The response streams one NDJSON line per row as each
+chunk commits, then a summary line.
+"""
+import csv
+import io
+import json
+import os
+import secrets
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+import crud
+import models
+from database import SessionLocal
+from hashing import hash_pool
+from response_cache import dumps
+from schemas import UserCreate
+
+CHUNK_SIZE = int(os.environ.get("LINKUS_ONBOARD_CHUNK_SIZE", "500"))
+MAX_ROWS = int(os.environ.get("LINKUS_ONBOARD_MAX_ROWS", "20000"))
+TEMPORARY_PASSWORD_BYTES = 9  # 12 characters, 72 bits
+
+STATUSES = ("created", "exists", "duplicate", "invalid")
+
+
+class Candidate(NamedTuple):
+    row: int
+    user: UserCreate
+    temporary: bool  # password was generated
+
+
+# --- Roster parsing ---
+def read_roster(filename: Optional[str], content: bytes) -> List[dict]:
+    """CSV (by extension) or JSON list of objects; 400/413 on a bad file"""
+    try:
+        text = content.decode("utf-8-sig")
+        if (filename or "").lower().endswith(".csv"):
+            rows = list(csv.DictReader(io.StringIO(text)))
+        else:
+            rows = json.loads(text)
+    except (UnicodeDecodeError, ValueError, csv.Error) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unreadable roster: {e}")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Roster must be a list of users")
+    if len(rows) > MAX_ROWS:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"At most {MAX_ROWS} users per import")
+    return rows
+
+
+def _validate(row: int, raw) -> Candidate:
+    """A Candidate, or ValueError with the reason"""
+    if not isinstance(raw, dict):
+        raise ValueError("not an object")
+    values = {k: v.strip() if isinstance(v, str) else v for k, v in raw.items() if k}
+    values = {k: v for k, v in values.items() if v not in (None, "")}
+    temporary = "password" not in values
+    if temporary:
+        values["password"] = secrets.token_urlsafe(TEMPORARY_PASSWORD_BYTES)
+    try:
+        return Candidate(row, UserCreate(**values), temporary)
+    except ValidationError as e:
+        raise ValueError("; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+
+
+# --- Database (thread pool) ---
+def taken_emails(emails: List[str]) -> Set[str]:
+    db = SessionLocal()
+    try:
+        return set(db.execute(crud.emails_taken(emails)).scalars())
+    finally:
+        db.close()
+
+
+def insert_users(rows: List[dict]) -> Set[str]:
+    """One executemany INSERT + commit; returns the emails registered meanwhile (skipped)"""
+    skipped: Set[str] = set()
+    db = SessionLocal()
+    try:
+        while rows:
+            try:
+                db.execute(insert(models.User), rows)
+                db.commit()
+                break
+            except IntegrityError:
+                # A signup took one of the emails since taken_emails(): drop those, retry
+                db.rollback()
+                taken = set(db.execute(crud.emails_taken([r["email"] for r in rows])).scalars())
+                if not taken:
+                    raise
+                skipped |= taken
+                rows = [r for r in rows if r["email"] not in taken]
+        return skipped
+    finally:
+        db.close()
+
+
+# --- Import ---
+async def import_users(rows: List[dict]) -> AsyncIterator[bytes]:
+    """NDJSON report lines, a chunk at a time, then {"summary": ...}"""
+    started = time.perf_counter()
+    counts: Dict[str, int] = dict.fromkeys(STATUSES, 0)
+    seen: Set[str] = set()
+
+    for start in range(0, len(rows), CHUNK_SIZE):
+        report: Dict[int, dict] = {}
+        candidates: List[Candidate] = []
+        for row, raw in enumerate(rows[start:start + CHUNK_SIZE], start + 1):
+            try:
+                candidate = _validate(row, raw)
+            except ValueError as e:
+                email = raw.get("email") if isinstance(raw, dict) else None
+                report[row] = {"row": row, "email": email, "status": "invalid", "error": str(e)}
+                continue
+            if candidate.user.email in seen:
+                report[row] = {"row": row, "email": candidate.user.email, "status": "duplicate"}
+                continue
+            seen.add(candidate.user.email)
+            candidates.append(candidate)
+
+        taken = await run_in_threadpool(taken_emails, [c.user.email for c in candidates]) if candidates else set()
+        new = [c for c in candidates if c.user.email not in taken]
+        hashes = await hash_pool.hash_many([(c.user.password, c.temporary) for c in new])
+        values = [crud.user_values(c.user, hashed, str(uuid.uuid4())) for c, hashed in zip(new, hashes)]
+        taken |= await run_in_threadpool(insert_users, values) if values else set()
+
+        for c, row_values in zip(new, values):
+            if c.user.email in taken:
+                continue
+            line = {"row": c.row, "email": c.user.email, "status": "created", "id": row_values["id"]}
+            if c.temporary:
+                line["password"] = c.user.password
+            report[c.row] = line
+        for c in candidates:
+            if c.user.email in taken:
+                report[c.row] = {"row": c.row, "email": c.user.email, "status": "exists"}
+
+        for row in sorted(report):
+            counts[report[row]["status"]] += 1
+            yield dumps(report[row]) + b"\n"
+
+    yield dumps({"summary": counts, "seconds": round(time.perf_counter() - started, 3)}) + b"\n"
+
+
+def import_users_response(rows: List[dict]) -> StreamingResponse:
+    return StreamingResponse(import_users(rows), media_type="application/x-ndjson")
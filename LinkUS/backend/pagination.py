@@ -0,0 +1,36 @@
+import base64
+import json
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+# --- Keyset Pagination Helpers ---
+# Cursors are opaque to clients: a urlsafe-base64 JSON array of the sort key
+# of the last row on the previous page, e.g. [created_at, id].
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(*key) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], *types: type) -> Optional[Tuple]:
+    """Decode a cursor into a tuple of values of `types` (400 on anything malformed)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        key = None
+    # bool is an int subclass, but never a valid key
+    if not isinstance(key, list) or len(key) != len(types) or not all(
+        isinstance(value, expected) and not isinstance(value, bool) for value, expected in zip(key, types)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return tuple(key)
@@ -0,0 +1,274 @@
+import contextvars
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from itertools import count
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+
+from auth import is_admin, token_subject
+
+# --- On-Demand Request Profiling ---
+# Off by default. With LINKUS_PROFILING=1 a request is profiled when
+# - it carries `X-Linkus-Profile: 1` and an admin's Bearer token, or
+# - it is drawn at random, with probability LINKUS_PROFILE_SAMPLE_RATE (0..1)
+# Otherwise the middleware and SQL hooks are not even installed, and an
+# unprofiled request costs one header scan.
+#
+# A profiled request gets a sampler thread that records the stacks of every
+# other thread each LINKUS_PROFILE_INTERVAL_MS, py-spy style: sync endpoints
+# and dependencies run on the thread pool, where a per-thread profiler
+# (cProfile, setprofile) would not see them. Threads parked in a wait/select
+# are skipped; work of concurrent requests does show up. While a capture
+# runs, the interpreter's GIL switch interval is shortened to the sampling
+# interval, or a busy thread would starve the sampler for 5 ms at a time.
+# The SQL statements
+# the request executed (no parameters) are recorded with their timings.
+#
+# Profiles are JSON files in LINKUS_PROFILE_DIR, the newest
+# LINKUS_PROFILE_KEEP kept, shared by all workers; browse them through
+# /api/admin/profiles. `?format=folded` gives collapsed stacks for
+# flamegraph.pl or speedscope.
+
+PROFILING_ENABLED = os.environ.get("LINKUS_PROFILING", "0").lower() in ("1", "true", "yes")
+SAMPLE_RATE = float(os.environ.get("LINKUS_PROFILE_SAMPLE_RATE", "0"))
+INTERVAL = float(os.environ.get("LINKUS_PROFILE_INTERVAL_MS", "1")) / 1000
+PROFILE_DIR = os.path.abspath(os.environ.get("LINKUS_PROFILE_DIR", "profiles"))
+PROFILE_KEEP = int(os.environ.get("LINKUS_PROFILE_KEEP", "100"))
+MAX_ACTIVE = int(os.environ.get("LINKUS_PROFILE_MAX_ACTIVE", "2"))  # concurrent captures per worker
+MAX_STATEMENTS = 500
+MAX_STATEMENT_CHARS = 1000
+
+# Long-lived streams are never drawn at random
+STREAMING_PATHS = ("/api/posts/stream",)
+PROFILE_HEADER = b"x-linkus-profile"
+SAMPLER_NAME = "linkus-profiler"
+PROFILE_ID = re.compile(r"^[0-9]+-[0-9]+-[0-9]+$")
+
+# Leaf frames of a thread that is waiting, not working
+IDLE_FRAMES = {
+    ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"), ("queue.py", "get"),
+}
+
+
+class StackSampler(threading.Thread):
+    """Counts the folded stacks of all other threads every `interval` seconds"""
+
+    def __init__(self, interval: float = INTERVAL):
+        super().__init__(name=SAMPLER_NAME, daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._labels: Dict[object, str] = {}  # code object -> frame label
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, str(ident))
+                if name == SAMPLER_NAME:
+                    continue
+                if (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(name)
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        """Ask the thread to finish; join() before reading the stacks"""
+        self._stop_event.set()
+
+
+class Capture:
+    """One profiled request (carried in a ContextVar, like metrics.RequestStats)"""
+
+    def __init__(self, profile_id: str, scope, trigger: str):
+        self.id = profile_id
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.trigger = trigger
+        self.started_at = time.time()
+        self.status = 500
+        self.statements: List[dict] = []
+        self.sampler = StackSampler()
+
+    def to_dict(self, seconds: float) -> dict:
+        leaves = Counter()
+        for stack, n in self.sampler.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += n
+        return {
+            "id": self.id, "method": self.method, "path": self.path, "status": self.status,
+            "trigger": self.trigger, "started_at": self.started_at, "duration_ms": round(seconds * 1000, 3),
+            "interval_ms": self.sampler.interval * 1000, "samples": self.sampler.samples,
+            "sql_count": len(self.statements), "sql_ms": round(sum(s["ms"] for s in self.statements), 3),
+            "top_frames": leaves.most_common(15),
+            "sql": self.statements,
+            "stacks": dict(self.sampler.stacks.most_common()),
+        }
+
+
+_capture: contextvars.ContextVar[Optional[Capture]] = contextvars.ContextVar("linkus_profile", default=None)
+
+
+# --- SQLAlchemy hooks ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _capture.get() is not None:
+        conn.info["linkus_profile_start"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("linkus_profile_start", None)
+    capture = _capture.get()
+    if started is None or capture is None or len(capture.statements) >= MAX_STATEMENTS:
+        return
+    capture.statements.append({
+        "sql": statement[:MAX_STATEMENT_CHARS],
+        "ms": round((time.perf_counter() - started) * 1000, 3),
+        "executemany": executemany,
+        "thread": threading.current_thread().name,
+    })
+
+def instrument_engine(engine):
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- Ring buffer on disk ---
+class ProfileStore:
+    def __init__(self, directory: str = PROFILE_DIR, keep: int = PROFILE_KEEP):
+        self.directory = directory
+        self.keep = keep
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def _ids(self) -> List[str]:
+        """Stored profile ids, newest first (ids start with a millisecond timestamp)"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        ids = [name[:-5] for name in names if name.endswith(".json") and PROFILE_ID.match(name[:-5])]
+        return sorted(ids, key=lambda i: tuple(map(int, i.split("-"))), reverse=True)
+
+    def save(self, profile: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self._path(profile["id"]) + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(profile, f, ensure_ascii=False)
+        os.replace(temporary, self._path(profile["id"]))
+        for old in self._ids()[self.keep:]:
+            try:
+                os.remove(self._path(old))
+            except FileNotFoundError:
+                pass  # another worker pruned it first
+
+    def load(self, profile_id: str) -> Optional[dict]:
+        if not PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def summaries(self) -> List[dict]:
+        result = []
+        for profile_id in self._ids():
+            profile = self.load(profile_id)
+            if profile is not None:
+                result.append({k: v for k, v in profile.items() if k not in ("sql", "stacks", "top_frames")})
+        return result
+
+
+profile_store = ProfileStore()
+
+
+def folded(profile: dict) -> str:
+    """Collapsed stacks ("a;b;c count" lines), the flamegraph input format"""
+    return "".join(f"{stack} {n}\n" for stack, n in profile["stacks"].items())
+
+
+# --- ASGI middleware ---
+class ProfilingMiddleware:
+    def __init__(self, app, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+        self.active = 0
+        self._ids = count(1)
+        self._switch_interval = sys.getswitchinterval()
+
+    def _trigger(self, scope) -> Optional[str]:
+        requested, token = False, None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                requested = value == b"1"
+            elif name == b"authorization" and value[:7].lower() == b"bearer ":
+                token = value[7:].decode("latin-1")
+        if requested and token is not None and is_admin(token_subject(token)):
+            return "header"
+        if SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE and scope["path"] not in STREAMING_PATHS:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.active >= MAX_ACTIVE:
+            await self.app(scope, receive, send)
+            return
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{int(time.time() * 1000)}-{os.getpid()}-{next(self._ids)}"
+        capture = Capture(profile_id, scope, trigger)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                capture.status = message["status"]
+                message = dict(message, headers=[*message.get("headers", []),
+                                                 (b"x-linkus-profile-id", profile_id.encode())])
+            await send(message)
+
+        self.active += 1
+        if self.active == 1:
+            sys.setswitchinterval(min(self._switch_interval, INTERVAL))
+        token = _capture.set(capture)
+        started = time.perf_counter()
+        capture.sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            capture.sampler.stop()
+            seconds = time.perf_counter() - started
+            _capture.reset(token)
+            self.active -= 1
+            if self.active == 0:
+                sys.setswitchinterval(self._switch_interval)
+            # The response is already sent: saving does not delay it
+            await run_in_threadpool(self._save, capture, seconds)
+
+    def _save(self, capture: Capture, seconds: float):
+        # Joined here, on the thread pool, not on the event loop
+        capture.sampler.join()
+        self.store.save(capture.to_dict(seconds))
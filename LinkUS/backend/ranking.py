@@ -0,0 +1,289 @@
+import heapq
+import os
+import threading
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+from catalog import CatalogItem, EventItem, JobItem, Projection, catalog, normalize_nationality
+from search import tokenize
+from ttl_cache import TTLCache
+
+# NumPy is optional (pure-Python scoring is the fallback) and only imported
+# by the first build, so it stays off the worker's import path
+np = None
+_numpy_checked = False
+
+
+def _load_numpy():
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        _numpy_checked = True
+
+
+# --- Personalized Catalog Ranking (GET /api/all/personalized) ---
+# Ranks events and jobs against the logged-in user's profile (major,
+# university, year, nationality) instead of /api/all's fixed nationality
+# sort. Item features are precomputed once per catalog version as sparse
+# vectors stored column-wise, term -> (item indexes, weights). A profile is
+# a handful of weighted terms, so scoring is one vectorized add per profile
+# term plus a partial sort for the top K. Ranked results are cached per
+# (profile, catalog version, kind, K): editing the profile or importing a
+# catalog simply misses the cache.
+
+TOP_K = int(os.environ.get("LINKUS_RANKING_TOP_K", "50"))
+MAX_TOP_K = 500
+CACHE_SIZE = int(os.environ.get("LINKUS_RANKING_CACHE_SIZE", "10000"))
+CACHE_TTL = float(os.environ.get("LINKUS_RANKING_CACHE_TTL", "3600"))
+
+# Item side: how strongly a field ties an item to a term (max over fields)
+FIELD_WEIGHTS = (
+    (0.5, ("company", "company_ko", "organizer")),
+    (1.0, ("description", "description_ko")),
+    (2.0, ("title", "title_ko", "requirements")),
+)
+LOCATION_FIELDS = ("location", "location_ko")
+
+# Profile side
+MAJOR_WEIGHT = 1.0
+LOCATION_WEIGHT = 1.5
+YEAR_WEIGHT = 0.75
+VISA_WEIGHT = 2.0  # foreigners: sponsorship outweighs a single topic match
+
+# A major matching any key also looks for the related terms
+MAJOR_TOPICS = (
+    (("computer", "cs", "software", "컴퓨터", "소프트웨어", "전산"),
+     "software developer engineering python java programming data ai 개발 소프트웨어 프로그래밍"),
+    (("statistics", "data", "math", "mathematics", "통계", "수학", "데이터"),
+     "data statistics sql python machine learning analysis 데이터 분석"),
+    (("business", "management", "marketing", "economics", "경영", "마케팅", "경제"),
+     "marketing business management brand content creative 마케팅 경영"),
+    (("design", "art", "디자인", "미술"),
+     "design creative ui ux art 디자인"),
+    (("english", "language", "literature", "영문", "영어", "어학", "국문"),
+     "english language writing translation teaching 영어 언어 번역"),
+    (("education", "교육"),
+     "teaching education tutoring volunteer 교육 봉사"),
+)
+
+# Where each university's students are (matched against item locations)
+UNIVERSITY_LOCATIONS = {
+    "서울대학교": "seoul 서울 snu",
+    "연세대학교": "seoul 서울 yonsei 신촌",
+    "고려대학교": "seoul 서울 안암",
+    "성균관대학교": "seoul 서울 suwon 수원",
+    "한양대학교": "seoul 서울",
+    "중앙대학교": "seoul 서울",
+    "경희대학교": "seoul 서울",
+    "서강대학교": "seoul 서울 신촌",
+    "이화여자대학교": "seoul 서울 신촌",
+    "홍익대학교": "seoul 서울 hongdae 홍대",
+    "경북대학교": "daegu 대구 kyungpook",
+    "KAIST": "daejeon 대전 kaist",
+    "POSTECH": "pohang 포항 postech",
+}
+
+# Item types that suit each study year (4 = final year and beyond)
+YEAR_TYPES = {
+    1: ("event", "volunteer"),
+    2: ("event", "competition"),
+    3: ("competition", "internship"),
+    4: ("internship", "full-time"),
+}
+
+
+def _item_terms(item: CatalogItem, tokens_of) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for weight, fields in FIELD_WEIGHTS:  # ascending, so the strongest field wins
+        texts = []
+        for field in fields:
+            value = item.get(field)
+            if value:
+                texts.extend(value) if isinstance(value, tuple) else texts.append(value)
+        for token in tokens_of(" ".join(texts)):
+            weights[token] = weight
+    for field in LOCATION_FIELDS:
+        for token in tokens_of(item.get(field)):
+            weights["loc:" + token] = 1.0
+    if item.get("type"):
+        weights["type:" + item.type.lower()] = 1.0
+    return weights
+
+
+def profile_terms(user) -> Dict[str, float]:
+    """Weighted terms describing what `user` is likely interested in"""
+    terms: Dict[str, float] = {}
+    major = (user.major or "").lower()
+    major_tokens = set(tokenize(major))
+    related = []
+    for keys, topic in MAJOR_TOPICS:
+        # Latin keys match whole words ("cs" must not match "physics")
+        if any(k in major_tokens if k.isascii() else k in major for k in keys):
+            related.append(topic)
+    for token in major_tokens.union(*(tokenize(topic) for topic in related)):
+        terms[token] = MAJOR_WEIGHT
+    for token in tokenize(UNIVERSITY_LOCATIONS.get(user.university or "", "")):
+        terms["loc:" + token] = LOCATION_WEIGHT
+    year = min(max(user.year or 1, 1), 4)
+    for item_type in YEAR_TYPES[year]:
+        terms["type:" + item_type] = YEAR_WEIGHT
+    return terms
+
+
+class _KindModel:
+    """Feature postings and filter masks for one kind, in catalog order"""
+    __slots__ = ("items", "postings", "for_foreigners", "for_koreans", "visa")
+
+    def __init__(self, items: Tuple[CatalogItem, ...]):
+        _load_numpy()
+        self.items = items
+        memo: Dict[Optional[str], Tuple[str, ...]] = {}  # locations, companies... repeat a lot
+
+        def tokens_of(text):
+            tokens = memo.get(text)
+            if tokens is None:
+                tokens = memo[text] = tuple(set(tokenize(text)))
+            return tokens
+
+        # One flat (term, item, weight) triple per feature, grouped by term below
+        vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        item_ids: List[int] = []
+        weights: List[float] = []
+        for index, item in enumerate(items):
+            features = _item_terms(item, tokens_of)
+            term_ids.extend([vocabulary.setdefault(term, len(vocabulary)) for term in features])
+            item_ids.extend(repeat(index, len(features)))
+            weights.extend(features.values())
+        for_foreigners = [item.get("forForeigners") is not False for item in items]
+        for_koreans = [item.get("forKoreans") is not False for item in items]
+        visa = [1.0 if item.get("visaSponsorship") else 0.0 for item in items]
+
+        if np is not None:
+            order = np.argsort(np.array(term_ids, dtype=np.int32), kind="stable")
+            indexes = np.array(item_ids, dtype=np.int32)[order]
+            values = np.array(weights, dtype=np.float32)[order]
+            ends = np.cumsum(np.bincount(np.array(term_ids, dtype=np.int32), minlength=len(vocabulary)))
+            self.postings = {
+                term: (indexes[ends[i] - count:ends[i]], values[ends[i] - count:ends[i]])
+                for (term, i), count in zip(vocabulary.items(), np.diff(ends, prepend=0).tolist())
+            }
+            self.for_foreigners = np.array(for_foreigners, dtype=bool)
+            self.for_koreans = np.array(for_koreans, dtype=bool)
+            self.visa = np.array(visa, dtype=np.float32)
+        else:
+            columns = [([], []) for _ in vocabulary]
+            for term_id, index, weight in zip(term_ids, item_ids, weights):
+                columns[term_id][0].append(index)
+                columns[term_id][1].append(weight)
+            self.postings = dict(zip(vocabulary, columns))
+            self.for_foreigners, self.for_koreans, self.visa = for_foreigners, for_koreans, visa
+
+    def _mask(self, nationality: Optional[str]):
+        if nationality == "foreigner":
+            return self.for_foreigners
+        if nationality == "korean":
+            return self.for_koreans
+        return None
+
+    def top(self, terms: Dict[str, float], nationality: Optional[str], k: int):
+        """(items, scores, number of eligible items), best first; ties keep catalog order"""
+        if np is None:
+            return self._top_python(terms, nationality, k)
+        scores = np.zeros(len(self.items), dtype=np.float32)
+        for term, weight in terms.items():
+            posting = self.postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += weight * posting[1]
+        if nationality == "foreigner":
+            scores += VISA_WEIGHT * self.visa
+        mask = self._mask(nationality)
+        candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(self.items))
+        selected = scores[candidates]
+        if len(candidates) > k:
+            # argpartition breaks ties arbitrarily: keep the earliest of the
+            # items tied with the K-th score instead
+            kth = np.partition(selected, len(selected) - k)[len(selected) - k]
+            above = np.flatnonzero(selected > kth)
+            tied = np.flatnonzero(selected == kth)[:k - len(above)]
+            part = np.concatenate((above, tied))
+        else:
+            part = np.arange(len(candidates))
+        order = part[np.lexsort((part, -selected[part]))]
+        return (
+            tuple(self.items[i] for i in candidates[order]),
+            tuple(round(float(s), 3) for s in selected[order]),
+            len(candidates),
+        )
+
+    def _top_python(self, terms, nationality, k):
+        scores = [0.0] * len(self.items)
+        for term, weight in terms.items():
+            posting = self.postings.get(term)
+            if posting is not None:
+                for index, item_weight in zip(*posting):
+                    scores[index] += weight * item_weight
+        if nationality == "foreigner":
+            scores = [s + VISA_WEIGHT * v for s, v in zip(scores, self.visa)]
+        mask = self._mask(nationality)
+        candidates = [i for i in range(len(self.items)) if mask is None or mask[i]]
+        best = heapq.nsmallest(k, candidates, key=lambda i: (-scores[i], i))
+        return tuple(self.items[i] for i in best), tuple(round(scores[i], 3) for i in best), len(candidates)
+
+
+class RankingEngine:
+    def __init__(self):
+        self.cache = TTLCache(CACHE_SIZE, CACHE_TTL)
+        self._state: Tuple[Optional[int], Dict[str, _KindModel]] = (None, {})
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Rebuild the features if the catalog changed since the last build"""
+        with self._lock:
+            version = catalog.version
+            if self._state[0] != version:
+                events, jobs = catalog.events(), catalog.jobs()
+                self._state = (version, {"event": _KindModel(events), "job": _KindModel(jobs)})
+
+    def _current(self) -> Tuple[int, Dict[str, _KindModel]]:
+        state = self._state
+        if state[0] != catalog.version:
+            if state[0] is None:
+                self.refresh()  # nothing to serve yet
+                state = self._state
+            elif not self._lock.locked():
+                # A rebuild takes seconds at 50k items: keep ranking against
+                # the previous catalog until it is done
+                threading.Thread(target=self.refresh, name="ranking-refresh", daemon=True).start()
+        return state
+
+    def rank(self, user, kind: str, k: int = TOP_K):
+        """Top `k` items of `kind` for `user`: (items, scores, number eligible)"""
+        version, models = self._current()
+        nationality = normalize_nationality(user.nationality)
+        key = (user.id, user.major, user.university, user.year, nationality, version, kind, k)
+        result = self.cache.get(key)
+        if result is None:
+            result = models[kind].top(profile_terms(user), nationality, k)
+            self.cache.set(key, result)
+        return result
+
+
+ranking_engine = RankingEngine()
+
+
+def personalized_payload(user, limit: int = TOP_K, lang: Optional[str] = None, fields=None) -> dict:
+    """/api/all's shape, each list ranked for `user` and cut to `limit`"""
+    events, event_scores, total_events = ranking_engine.rank(user, "event", limit)
+    jobs, job_scores, total_jobs = ranking_engine.rank(user, "job", limit)
+    return {
+        "events": Projection(EventItem, lang, fields).apply(events),
+        "jobs": Projection(JobItem, lang, fields).apply(jobs),
+        "event_scores": event_scores,
+        "job_scores": job_scores,
+        "total_events": total_events,
+        "total_jobs": total_jobs
+    }
@@ -0,0 +1,228 @@
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, NamedTuple, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+
+import models
+from auth import get_current_user_email
+from database import SessionLocal
+from ttl_cache import TTLCache
+
+# --- Rate Limiting and Admission Control ---
+# Two layers, both checked before any password hashing or DB work:
+# - Token buckets per client: auth endpoints are keyed by client IP, writes
+#   by the token's `sub`. An empty bucket -> 429 + Retry-After (seconds
+#   until the next token).
+# - Concurrency limits for the CPU-heavy route groups (auth, search,
+#   personalized ranking): beyond LINKUS_MAX_<GROUP> requests in flight in
+#   this worker -> 503 + Retry-After, so a flood sheds early and the cheap
+#   reads keep their latency.
+#
+# Buckets live in a backend (LINKUS_RATE_LIMIT_BACKEND):
+# - local (default): in-process; every gunicorn worker enforces its own
+#   copy, so a client effectively gets workers x the limit
+# - database: the rate_limit_buckets table, shared by all workers
+# The client IP is X-Real-IP only when the peer is a trusted proxy (nginx).
+# If the backend fails, requests are let through: limiting must not take
+# logins down with it.
+
+RATE_LIMIT_ENABLED = os.environ.get("LINKUS_RATE_LIMIT", "1").lower() in ("1", "true", "yes")
+RATE_LIMIT_BACKEND = os.environ.get("LINKUS_RATE_LIMIT_BACKEND", "local")
+TRUSTED_PROXIES = frozenset(
+    p.strip() for p in os.environ.get("LINKUS_TRUSTED_PROXIES", "127.0.0.1,::1").split(",") if p.strip()
+)
+LOCAL_MAX_KEYS = int(os.environ.get("LINKUS_RATE_LIMIT_MAX_KEYS", "100000"))
+
+logger = logging.getLogger("linkus.rate_limit")
+
+
+class Rule(NamedTuple):
+    capacity: float  # burst size
+    per_second: float  # refill rate
+
+    @classmethod
+    def parse(cls, text: str) -> "Rule":
+        """"<requests>/<seconds>", e.g. "30/60" = a burst of 30, refilled over a minute"""
+        requests, seconds = text.split("/")
+        return cls(float(requests), float(requests) / float(seconds))
+
+    @property
+    def full_after(self) -> float:
+        """Seconds for an empty bucket to fill up again"""
+        return self.capacity / self.per_second
+
+
+# Campus networks put many students behind one IP: the IP rules are generous
+RULES = {
+    "login": Rule.parse(os.environ.get("LINKUS_RATE_LOGIN", "30/60")),  # per IP
+    "signup": Rule.parse(os.environ.get("LINKUS_RATE_SIGNUP", "20/3600")),  # per IP
+    "post": Rule.parse(os.environ.get("LINKUS_RATE_POST", "20/60")),  # per user
+    "delete": Rule.parse(os.environ.get("LINKUS_RATE_DELETE", "60/60")),  # per user
+}
+
+
+def _consume(tokens: float, updated_at: float, rule: Rule, now: float) -> Tuple[float, float]:
+    """Refill, then take one token: (tokens left, seconds to wait; 0 = allowed)"""
+    tokens = min(rule.capacity, tokens + max(0.0, now - updated_at) * rule.per_second)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rule.per_second
+
+
+# --- Backends ---
+class LocalRateLimitBackend:
+    blocking = False
+
+    def __init__(self, max_keys: int = LOCAL_MAX_KEYS):
+        # An entry expires once its bucket would be full again; an evicted
+        # or expired key simply starts over with a full bucket
+        self._buckets = TTLCache(max_keys, max(rule.full_after for rule in RULES.values()))
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rule: Rule) -> float:
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (rule.capacity, now))
+            tokens, wait = _consume(tokens, updated_at, rule, now)
+            self._buckets.set(key, (tokens, now), expires_at=now + (rule.capacity - tokens) / rule.per_second)
+        return wait
+
+
+class DatabaseRateLimitBackend:
+    blocking = True  # called on the thread pool
+    PRUNE_EVERY = 1000
+
+    def __init__(self):
+        self._takes = 0
+
+    def take(self, key: str, rule: Rule) -> float:
+        now = time.time()
+        db = SessionLocal()
+        try:
+            for _ in range(2):
+                bucket = db.execute(
+                    select(models.RateLimitBucket).where(models.RateLimitBucket.key == key).with_for_update()
+                ).scalars().first()
+                if bucket is None:
+                    tokens, wait = _consume(rule.capacity, now, rule, now)
+                    db.add(models.RateLimitBucket(key=key, tokens=tokens, updated_at=now))
+                else:
+                    tokens, wait = _consume(bucket.tokens, bucket.updated_at, rule, now)
+                    bucket.tokens, bucket.updated_at = tokens, now
+                try:
+                    db.commit()
+                    break
+                except IntegrityError:
+                    db.rollback()  # another worker created the bucket first; update it
+            self._takes += 1
+            if self._takes % self.PRUNE_EVERY == 0:
+                # Untouched for longer than any rule needs to refill = full
+                oldest = now - max(r.full_after for r in RULES.values())
+                db.execute(delete(models.RateLimitBucket).where(models.RateLimitBucket.updated_at < oldest))
+                db.commit()
+            return wait
+        finally:
+            db.close()
+
+
+BACKENDS = {"local": LocalRateLimitBackend, "database": DatabaseRateLimitBackend}
+
+
+class RateLimiter:
+    def __init__(self, backend, enabled: bool = RATE_LIMIT_ENABLED):
+        self.backend = backend
+        self.enabled = enabled
+        self.rejected: Dict[str, int] = {name: 0 for name in RULES}
+
+    async def check(self, rule_name: str, client: str):
+        """Take a token from `client`'s `rule_name` bucket, or raise 429"""
+        if not self.enabled:
+            return
+        rule, key = RULES[rule_name], f"{rule_name}:{client}"
+        try:
+            if self.backend.blocking:
+                wait = await run_in_threadpool(self.backend.take, key, rule)
+            else:
+                wait = self.backend.take(key, rule)
+        except Exception:
+            logger.exception("rate limit backend failed; letting %s through", key)
+            return
+        if wait > 0:
+            self.rejected[rule_name] += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please retry later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+
+rate_limiter = RateLimiter(BACKENDS[RATE_LIMIT_BACKEND]())
+
+
+def client_ip(request: Request) -> str:
+    peer = request.client.host if request.client else "unknown"
+    if peer in TRUSTED_PROXIES:
+        return request.headers.get("x-real-ip", peer).strip()
+    return peer
+
+
+# Route dependencies, e.g. dependencies=[Depends(limit_by_ip("login"))].
+# Route-level dependencies run before the endpoint's own (DB session, user).
+def limit_by_ip(rule_name: str):
+    async def dependency(request: Request):
+        await rate_limiter.check(rule_name, client_ip(request))
+    return dependency
+
+
+def limit_by_user(rule_name: str):
+    # get_current_user_email is cached per request, so the token is decoded once
+    async def dependency(email: str = Depends(get_current_user_email)):
+        await rate_limiter.check(rule_name, email)
+    return dependency
+
+
+# --- Concurrency Limits ---
+class ConcurrencyLimit:
+    """At most `limit` requests of one route group in flight in this worker"""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self.rejected = 0
+
+    # Async, so `active` is only touched from the event loop thread
+    async def __call__(self):
+        if 0 < self.limit <= self.active:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+
+
+auth_slots = ConcurrencyLimit("auth", int(os.environ.get("LINKUS_MAX_AUTH", "32")))
+search_slots = ConcurrencyLimit("search", int(os.environ.get("LINKUS_MAX_SEARCH", "16")))
+ranking_slots = ConcurrencyLimit("ranking", int(os.environ.get("LINKUS_MAX_RANKING", "16")))
+
+
+def admission_status() -> Dict[str, int]:
+    """Gauges for /metrics"""
+    result = {f"rate_limited_{name}": count for name, count in rate_limiter.rejected.items()}
+    for slots in (auth_slots, search_slots, ranking_slots):
+        result[f"{slots.name}_in_flight"] = slots.active
+        result[f"{slots.name}_rejected"] = slots.rejected
+    return result
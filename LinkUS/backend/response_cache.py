@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is the fallback
+    orjson = None
+
+# --- Pre-serialized Response Cache ---
+# Catalog responses depend only on the normalized query and the catalog
+# version, so the encoded body and its ETag are built once and reused.
+# Changing the version invalidates every entry.
+
+MAX_ENTRIES = 256
+# How long browsers / the Nginx proxy may reuse a response before revalidating
+MAX_AGE = int(os.environ.get("LINKUS_CATALOG_MAX_AGE", "15"))
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 7232 prescribes for If-None-Match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class _Entry:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._version = None
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int, build: Callable[[], object]) -> _Entry:
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        # Encode outside the lock; a concurrent miss just builds the same bytes
+        entry = _Entry(dumps(build()))
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = entry
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def respond(self, request: Request, key: Hashable, version: int, build: Callable[[], object]) -> Response:
+        """Serve the cached body, or a bare 304 when the client's ETag matches"""
+        entry = self.get(key, version, build)
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": f"public, max-age={MAX_AGE}",
+        }
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache()
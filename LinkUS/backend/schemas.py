@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+from typing import Optional
+
+# --- Models (Pydantic) ---
+class UserBase(BaseModel):
+    email: str
+    name: str
+    university: str
+    nationality: str # 'korean' or 'foreigner'
+    major: str
+    year: int
+
+class UserCreate(UserBase):
+    password: str
+
+class User(UserBase):
+    id: str
+    joinedDate: str
+    profileImage: str
+
+    class Config:
+        orm_mode = True
+
+class PostCreate(BaseModel):
+    title: str
+    content: str
+    category: str = "general"
+
+class PostResponse(BaseModel):
+    id: str
+    author_id: Optional[str] = None
+    author_email: str
+    author_name: Optional[str] = None
+    author_university: Optional[str] = None
+    author_nationality: Optional[str] = None
+    title: str
+    content: str
+    category: str
+    created_at: str
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,244 @@
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+import models
+from catalog import catalog
+from database import SessionLocal
+
+# --- Full-text Search (in-process inverted index) ---
+# Latin/digit runs are indexed as whole lowercase words; Hangul runs as
+# character bigrams, so "등산" matches "등산에" without a morphological
+# analyzer, and as single characters, so a one-syllable query ("등") matches
+# too. Queries are AND-ed across terms and ranked by weighted tf-idf.
+#
+# Posts are added/removed incrementally by create_post/delete_post. Other
+# workers' writes are picked up by a cheap (count, max(created_at)) check at
+# most every LINKUS_SEARCH_SYNC_SECONDS; the catalog is re-indexed whenever
+# its version changes.
+
+SYNC_SECONDS = float(os.environ.get("LINKUS_SEARCH_SYNC_SECONDS", "5"))
+TITLE_WEIGHT = 3.0
+BODY_WEIGHT = 1.0
+# Multi-term queries matching more docs than this are ranked approximately
+MAX_SCORED = int(os.environ.get("LINKUS_SEARCH_MAX_SCORED", "2000"))
+
+# Catalog fields indexed at body weight besides the descriptions
+CATALOG_EXTRA_FIELDS = ("company", "company_ko", "location", "location_ko", "organizer")
+
+_TOKEN_RE = re.compile(r"[가-힣]+|[^\W_가-힣]+")
+
+DocKey = Tuple[str, object]  # (type, id)
+
+
+def tokenize(text: Optional[str], unigrams: bool = False) -> List[str]:
+    """Query terms; `unigrams` adds every Hangul character (document side)"""
+    tokens = []
+    for run in _TOKEN_RE.findall((text or "").lower()):
+        if "가" <= run[0] <= "힣":
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+                if unigrams:
+                    tokens.extend(run)
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def _post_fields(post) -> dict:
+    return {c.name: getattr(post, c.name) for c in models.Post.__table__.columns}
+
+
+class SearchIndex:
+    def __init__(self):
+        # Postings are keyed by small ints: int sets intersect far faster
+        # than sets of (type, id) tuples, whose hashes are not cached
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._impact_cache: Dict[str, List[Tuple[float, int]]] = {}
+        self._docnos: Dict[DocKey, int] = {}
+        self._entries: Dict[int, Tuple[DocKey, dict]] = {}
+        self._next_docno = 0
+        self._lock = threading.RLock()
+        self._catalog_version = None
+        self._posts_state = None  # (count, max created_at) last seen in the DB
+        self._posts_watermark = ""
+        self._synced_at = 0.0
+        self._sync_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --- Indexing ---
+    def _add(self, key: DocKey, doc: dict, titles: Iterable[str], bodies: Iterable[str]):
+        weights: Dict[str, float] = defaultdict(float)
+        for text in titles:
+            for token in tokenize(text, unigrams=True):
+                weights[token] += TITLE_WEIGHT
+        for text in bodies:
+            for token in tokenize(text, unigrams=True):
+                weights[token] += BODY_WEIGHT
+        with self._lock:
+            self._remove(key)
+            docno = self._next_docno
+            self._next_docno += 1
+            for token, weight in weights.items():
+                self._postings[token][docno] = weight
+                self._impact_cache.pop(token, None)
+            self._doc_terms[docno] = tuple(weights)
+            self._docnos[key] = docno
+            self._entries[docno] = (key, doc)
+
+    def _remove(self, key: DocKey):
+        with self._lock:
+            docno = self._docnos.pop(key, None)
+            if docno is None:
+                return
+            for token in self._doc_terms.pop(docno, ()):
+                self._impact_cache.pop(token, None)
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.pop(docno, None)
+                    if not postings:
+                        del self._postings[token]
+            del self._entries[docno]
+
+    def add_post(self, post):
+        doc = post if isinstance(post, dict) else _post_fields(post)
+        self._add(("post", doc["id"]), doc, [doc.get("title")], [doc.get("content")])
+        if (doc.get("created_at") or "") > self._posts_watermark:
+            self._posts_watermark = doc["created_at"]
+
+    def remove_post(self, post_id: str):
+        self._remove(("post", post_id))
+
+    def _index_catalog(self):
+        with self._lock:
+            for key in [k for k in self._docnos if k[0] in ("event", "job")]:
+                self._remove(key)
+            for kind, items in (("event", catalog.events()), ("job", catalog.jobs())):
+                for item in items:
+                    self._add(
+                        (kind, item["id"]), item,
+                        [item.get("title"), item.get("title_ko")],
+                        [item.get("description"), item.get("description_ko")]
+                        + [item.get(field) for field in CATALOG_EXTRA_FIELDS]
+                        + list(item.get("requirements") or ()),
+                    )
+            self._catalog_version = catalog.version
+
+    # --- Cross-worker sync ---
+    def sync(self, force: bool = False):
+        if self._catalog_version != catalog.version:
+            self._index_catalog()
+
+        now = time.monotonic()
+        if not force and now - self._synced_at < SYNC_SECONDS:
+            return
+        if not self._sync_lock.acquire(blocking=force):
+            return  # another thread is already syncing
+        self._synced_at = now
+        db = SessionLocal()
+        try:
+            state = tuple(db.execute(
+                select(func.count(models.Post.id), func.max(models.Post.created_at))
+            ).one())
+            if state == self._posts_state:
+                return
+            # New posts from other workers
+            for post in db.execute(
+                select(models.Post).where(models.Post.created_at > self._posts_watermark)
+            ).scalars():
+                self.add_post(post)
+            # Deletions elsewhere show up as a count mismatch
+            indexed = {key[1] for key in self._docnos if key[0] == "post"}
+            if len(indexed) != state[0]:
+                live = set(db.execute(select(models.Post.id)).scalars())
+                for post_id in indexed - live:
+                    self.remove_post(post_id)
+                for post in db.execute(select(models.Post).where(models.Post.id.in_(live - indexed))).scalars():
+                    self.add_post(post)
+            self._posts_state = state
+        finally:
+            db.close()
+            self._sync_lock.release()
+
+    # --- Querying ---
+    def _impacts(self, term: str) -> List[Tuple[float, int]]:
+        """Postings of `term` sorted by weight, cached until the term changes"""
+        impacts = self._impact_cache.get(term)
+        if impacts is None:
+            impacts = sorted(
+                ((weight, docno) for docno, weight in self._postings[term].items()),
+                key=itemgetter(0), reverse=True
+            )
+            self._impact_cache[term] = impacts
+        return impacts
+
+    def search(self, query: str, kind: Optional[str] = None, limit: int = 20, offset: int = 0):
+        """Ranked (total, [(score, doc_type, doc)]) for docs matching every term"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return 0, []
+        with self._lock:
+            if not all(term in self._postings for term in terms):
+                return 0, []
+            terms.sort(key=lambda term: len(self._postings[term]))
+            postings = [self._postings[term] for term in terms]
+            total_docs = len(self._entries)
+            weighted = [(p, math.log(1 + total_docs / len(p))) for p in postings]
+            wanted = offset + limit
+
+            if len(terms) == 1:
+                # Impact order is rank order for a single term
+                impacts = self._impacts(terms[0])
+                if kind:
+                    total = sum(1 for docno in postings[0] if self._kind(docno) == kind)
+                    impacts = (item for item in impacts if self._kind(item[1]) == kind)
+                else:
+                    total = len(impacts)
+                top = [(weight * weighted[0][1], docno) for weight, docno in islice(impacts, wanted)]
+                return total, self._page(top, offset)
+
+            # Intersect in C (set ops), then score only the survivors
+            candidates = postings[0].keys() & postings[1].keys()
+            for plist in postings[2:]:
+                candidates &= plist.keys()
+            if kind:
+                candidates = {docno for docno in candidates if self._kind(docno) == kind}
+            total = len(candidates)
+
+            if total > MAX_SCORED:
+                # Broad query: score the rarest term's highest-impact matches only
+                pool = (docno for _, docno in self._impacts(terms[0]) if docno in candidates)
+                candidates = list(islice(pool, max(MAX_SCORED, wanted)))
+
+            scored = [
+                (sum(plist[docno] * term_idf for plist, term_idf in weighted), docno)
+                for docno in candidates
+            ]
+            return total, self._page(heapq.nlargest(wanted, scored, key=itemgetter(0)), offset)
+
+    def _kind(self, docno: int) -> str:
+        return self._entries[docno][0][0]
+
+    def _page(self, top, offset: int):
+        page = []
+        for score, docno in top[offset:]:
+            key, doc = self._entries[docno]
+            page.append((round(score, 4), key[0], doc))
+        return page
+
+
+search_index = SearchIndex()
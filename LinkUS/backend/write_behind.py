@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+
+import crud
+import models
+from database import SessionLocal
+
+# --- Write-Behind Post Batching (LINKUS_POST_BATCHING=1) ---
+# create_post queues the new row and a background task inserts queued rows
+# with one executemany + one commit per batch, flushing when
+# LINKUS_POST_BATCH_SIZE rows are waiting or LINKUS_POST_BATCH_MS after the
+# first one arrived. The id and created_at are assigned before queueing, so
+# the response is complete immediately.
+#
+# Semantics:
+# - Ordering: one flusher per worker, rows are inserted in submission order.
+# - Durability: by default the response is sent before the commit, so a
+#   crash loses up to one batch window of acknowledged posts, and a GET right
+#   after the POST may not see the post yet. With LINKUS_POST_BATCH_WAIT=1
+#   the request awaits its batch's commit (group commit): fully durable,
+#   still one fsync per batch, at the cost of up to BATCH_MS extra latency.
+#   Callers must release their own DB connection before awaiting (see
+#   main.create_post), or waiting requests can starve the flusher of one.
+# - Search indexing and the live feed happen after the commit, never for
+#   rows that failed.
+# - Shutdown: lifespan calls drain(), which flushes everything queued.
+#   A SIGKILL skips it.
+# - Backpressure: beyond LINKUS_POST_QUEUE_MAX queued rows, 503 + Retry-After.
+
+BATCHING_ENABLED = os.environ.get("LINKUS_POST_BATCHING", "0").lower() in ("1", "true", "yes")
+BATCH_SIZE = int(os.environ.get("LINKUS_POST_BATCH_SIZE", "100"))
+BATCH_MS = float(os.environ.get("LINKUS_POST_BATCH_MS", "10"))
+BATCH_WAIT = os.environ.get("LINKUS_POST_BATCH_WAIT", "0").lower() in ("1", "true", "yes")
+QUEUE_MAX = int(os.environ.get("LINKUS_POST_QUEUE_MAX", "10000"))
+
+logger = logging.getLogger("linkus.write_behind")
+
+def _insert_batch(rows: List[dict]) -> List[Optional[Exception]]:
+    """Insert `rows` in one transaction; on failure fall back to one row per
+    transaction so a single bad row does not take the batch down with it"""
+    db = SessionLocal()
+    try:
+        try:
+            db.execute(insert(models.Post), rows)
+            db.commit()
+            return [None] * len(rows)
+        except Exception:
+            db.rollback()
+        errors: List[Optional[Exception]] = []
+        for row in rows:
+            try:
+                db.execute(insert(models.Post), [row])
+                db.commit()
+                errors.append(None)
+            except Exception as exc:
+                db.rollback()
+                errors.append(exc)
+        return errors
+    finally:
+        db.close()
+
+
+class PostWriter:
+    def __init__(self, batch_size: int = BATCH_SIZE, batch_ms: float = BATCH_MS,
+                 wait: bool = BATCH_WAIT, max_queued: int = QUEUE_MAX):
+        self.batch_size = batch_size
+        self.batch_seconds = batch_ms / 1000
+        self.wait = wait
+        self.max_queued = max_queued
+        self.on_commit = []  # callbacks(posts), run on the flusher thread after a commit
+        self.batches = 0
+        self.rows = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Own thread: a saturated request thread pool cannot delay flushes
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="post-writer")
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, post: models.Post):
+        """Queue `post`; with wait=True, return once it is committed"""
+        if self._queue is None:
+            raise RuntimeError("PostWriter.start() was not called")
+        if self._queue.qsize() >= self.max_queued:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        done = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((post, done))
+        if self.wait:
+            await done
+
+    async def _next_batch(self) -> List[Tuple[models.Post, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_seconds
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._flush(batch)
+            except Exception as exc:
+                # E.g. no database connection to be had: this batch fails,
+                # the flusher keeps going (and drain() still returns)
+                logger.exception("post batch of %d rows failed", len(batch))
+                self._settle(batch, [exc] * len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _commit(self, posts: List[models.Post]) -> List[Optional[Exception]]:
+        errors = _insert_batch([crud.post_row(post) for post in posts])
+        committed = [post for post, error in zip(posts, errors) if error is None]
+        for post, error in zip(posts, errors):
+            if error is not None:
+                logger.error("dropped post %s: %s", post.id, error)
+        for callback in self.on_commit if committed else ():
+            try:
+                callback(committed)
+            except Exception:
+                logger.exception("on_commit callback failed")
+        return errors
+
+    async def _flush(self, batch):
+        errors = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._commit, [post for post, _ in batch]
+        )
+        self.batches += 1
+        self._settle(batch, errors)
+
+    def _settle(self, batch, errors: List[Optional[Exception]]):
+        """Resolve the batch's futures with its per-row outcome"""
+        for (_, done), error in zip(batch, errors):
+            if error is None:
+                self.rows += 1
+            if done.done():
+                continue  # the waiting request was cancelled
+            if error is None:
+                done.set_result(None)
+            elif self.wait:
+                done.set_exception(error)
+            else:
+                done.cancel()  # nobody awaits it; the error is already logged
+
+    async def drain(self):
+        """Flush every queued post and stop the flusher"""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+
+post_writer = PostWriter()
@@ -92,6 +92,10 @@ User=$USER_NAME
 Group=www-data
 WorkingDirectory=$REPO_PATH/backend
 Environment="PATH=$REPO_PATH/backend/venv/bin"
+Environment="LINKUS_AUTO_MIGRATE=0"
+Environment="LINKUS_FEED_BACKEND=database"
+Environment="LINKUS_RATE_LIMIT_BACKEND=database"
+ExecStartPre=$REPO_PATH/backend/venv/bin/python migrations.py upgrade
 ExecStart=$REPO_PATH/backend/venv/bin/gunicorn -w 4 -k uvicorn.workers.UvicornWorker main:app --bind 0.0.0.0:8000
 
 [Install]
@@ -8,6 +8,9 @@ echo "Fixing cache headers in Nginx (v2)..."
 
 # 1. Update Nginx config with proper cache control
 sudo tee /etc/nginx/sites-available/linkus > /dev/null <<'EOF'
+# Shared cache for the catalog API (responses carry ETag + Cache-Control)
+proxy_cache_path /var/cache/nginx/linkus_api levels=1:2 keys_zone=linkus_api:10m max_size=100m inactive=10m;
+
 server {
     listen 80;
     server_name linkusknu.mooo.com _;
@@ -33,6 +36,30 @@ server {
         add_header Cache-Control "no-cache";
     }
 
+    # Catalog API - cached by Nginx, revalidated with If-None-Match
+    location ~ ^/api/(all|events|jobs)$ {
+        proxy_pass http://127.0.0.1:8000;
+        proxy_cache linkus_api;
+        proxy_cache_revalidate on;
+        proxy_cache_lock on;
+        proxy_cache_use_stale updating;
+        add_header X-Cache-Status $upstream_cache_status;
+        proxy_set_header Host $host;
+        proxy_set_header X-Real-IP $remote_addr;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+    }
+
+    # Live post feed (Server-Sent Events) - long-lived, never buffered
+    location = /api/posts/stream {
+        proxy_pass http://127.0.0.1:8000;
+        proxy_buffering off;
+        proxy_cache off;
+        proxy_read_timeout 1h;
+        proxy_set_header Host $host;
+        proxy_set_header X-Real-IP $remote_addr;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+    }
+
     # Backend API
     location /api {
         proxy_pass http://127.0.0.1:8000;
@@ -1,16 +1,23 @@
 #!/bin/bash
 
 # ==========================================
-# Fix Gunicorn Workers (Multi-process Memory Fix)
+# Fix Gunicorn Workers (Multi-process)
 # ==========================================
 
 echo "Fixing Gunicorn service..."
 
 USER_NAME=$(whoami)
 REPO_PATH=$(pwd)
-
-# Re-create service file with -w 1 (Single Worker)
-# This ensures all requests hit the SAME memory database
+WORKERS=${WORKERS:-4}
+# Comma-separated accounts allowed on admin endpoints (e.g. roster imports)
+ADMIN_EMAILS=${ADMIN_EMAILS:-}
+
+# Re-create service file with $WORKERS workers.
+# Events/Jobs live in the database; each worker keeps a snapshot that
+# reloads whenever the catalog version changes (catalog_store.py).
+# The live post feed is shared between workers through the database (feed.py).
+# Schema migrations run once before the workers fork (ExecStartPre); the
+# workers themselves refuse to start on an outdated schema (migrations.py).
 sudo tee /etc/systemd/system/linkus.service > /dev/null <<EOF
 [Unit]
 Description=Gunicorn instance to serve LINK-US Backend
@@ -21,7 +28,12 @@ User=$USER_NAME
 Group=www-data
 WorkingDirectory=$REPO_PATH/backend
 Environment="PATH=$REPO_PATH/backend/venv/bin"
-ExecStart=$REPO_PATH/backend/venv/bin/gunicorn -w 1 -k uvicorn.workers.UvicornWorker main:app --bind 0.0.0.0:8000
+Environment="LINKUS_AUTO_MIGRATE=0"
+Environment="LINKUS_FEED_BACKEND=database"
+Environment="LINKUS_RATE_LIMIT_BACKEND=database"
+Environment="LINKUS_ADMIN_EMAILS=$ADMIN_EMAILS"
+ExecStartPre=$REPO_PATH/backend/venv/bin/python migrations.py upgrade
+ExecStart=$REPO_PATH/backend/venv/bin/gunicorn -w $WORKERS -k uvicorn.workers.UvicornWorker main:app --bind 0.0.0.0:8000
 
 [Install]
 WantedBy=multi-user.target
@@ -32,6 +44,7 @@ sudo systemctl daemon-reload
 sudo systemctl restart linkus
 
 echo "=========================================="
-echo "Fixed! Server is now running in Single Process Mode."
-echo "Your memory database is now consistent."
+echo "Fixed! Server is now running with $WORKERS workers."
+echo "Catalog updates: python catalog_store.py --events FILE --jobs FILE"
+echo "Roster imports: POST /api/admin/users/import as one of ADMIN_EMAILS"
 echo "=========================================="
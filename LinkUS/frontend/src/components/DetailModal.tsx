@@ -3,16 +3,13 @@ import { useEffect } from 'react'
 interface EventItem {
     id: number
     title: string
-    title_ko: string
     type: string
     category: string
     date: string
     location: string
-    location_ko: string
     description: string
-    description_ko: string
-    forForeigners: boolean
-    forKoreans: boolean
+    forForeigners?: boolean
+    forKoreans?: boolean
     image: string
     organizer: string
 }
@@ -20,19 +17,15 @@ interface EventItem {
 interface JobItem {
     id: number
     title: string
-    title_ko: string
     company: string
-    company_ko: string
     location: string
-    location_ko: string
     type: string
     duration: string
     salary: string
     description: string
-    description_ko: string
     requirements: string[]
-    forForeigners: boolean
-    forKoreans: boolean
+    forForeigners?: boolean
+    forKoreans?: boolean
     visaSponsorship: boolean
     image: string
     deadline: string
@@ -99,10 +92,7 @@ function DetailModal({ isOpen, onClose, event, job, isKorean }: DetailModalProps
                             )}
                         </div>
                         <h1 className="modal-title">
-                            {isKorean
-                                ? (isEvent ? event!.title_ko : job!.title_ko)
-                                : (isEvent ? event!.title : job!.title)
-                            }
+                            {isEvent ? event!.title : job!.title}
                         </h1>
                     </div>
                 </div>
@@ -115,7 +105,7 @@ function DetailModal({ isOpen, onClose, event, job, isKorean }: DetailModalProps
                                     <span className="info-icon">📍</span>
                                     <div>
                                         <span className="info-label">{isKorean ? '장소' : 'Location'}</span>
-                                        <span className="info-value">{isKorean ? event!.location_ko : event!.location}</span>
+                                        <span className="info-value">{event!.location}</span>
                                     </div>
                                 </div>
                                 <div className="modal-info-item">
@@ -139,14 +129,14 @@ function DetailModal({ isOpen, onClose, event, job, isKorean }: DetailModalProps
                                     <span className="info-icon">🏢</span>
                                     <div>
                                         <span className="info-label">{isKorean ? '회사' : 'Company'}</span>
-                                        <span className="info-value">{isKorean ? job!.company_ko : job!.company}</span>
+                                        <span className="info-value">{job!.company}</span>
                                     </div>
                                 </div>
                                 <div className="modal-info-item">
                                     <span className="info-icon">📍</span>
                                     <div>
                                         <span className="info-label">{isKorean ? '위치' : 'Location'}</span>
-                                        <span className="info-value">{isKorean ? job!.location_ko : job!.location}</span>
+                                        <span className="info-value">{job!.location}</span>
                                     </div>
                                 </div>
                                 <div className="modal-info-item">
@@ -177,10 +167,7 @@ function DetailModal({ isOpen, onClose, event, job, isKorean }: DetailModalProps
                     <div className="modal-section">
                         <h3>{isKorean ? '상세 내용' : 'Description'}</h3>
                         <p className="modal-description">
-                            {isKorean
-                                ? (isEvent ? event!.description_ko : job!.description_ko)
-                                : (isEvent ? event!.description : job!.description)
-                            }
+                            {isEvent ? event!.description : job!.description}
                         </p>
                     </div>
 
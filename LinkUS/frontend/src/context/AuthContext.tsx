@@ -10,7 +10,7 @@ export interface User {
     year: number
     bio: string
     joinedDate: string
-    profileImage: string
+    profileImage: string  // avatar address, see avatarUrl()
 }
 
 interface AuthContextType {
@@ -32,6 +32,12 @@ export interface SignupData {
     year: number
 }
 
+// profileImage is an avatar address served by the API (a full URL in old sessions)
+export function avatarUrl(profileImage?: string): string | undefined {
+    if (!profileImage || profileImage.includes('/')) return profileImage
+    return `/api/avatars/${profileImage}.svg`
+}
+
 const AuthContext = createContext<AuthContextType | undefined>(undefined)
 
 const TOKEN_KEY = 'linkus_access_token'
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { useAuth } from '../context/AuthContext'
 
 interface CommunityPageProps {
@@ -21,6 +21,9 @@ interface Post {
 }
 
 type PostCategory = 'general' | 'qna' | 'events' | 'jobs' | 'tips'
+
+const POSTS_PAGE_SIZE = 20
+
 // Sample posts
 const SAMPLE_POSTS: Post[] = [
     {
@@ -86,35 +89,70 @@ function CommunityPage({ onBack, isKorean }: CommunityPageProps) {
     const [newPostContent, setNewPostContent] = useState('')
     const [newPostCategory, setNewPostCategory] = useState<PostCategory>('general')
 
-    useEffect(() => {
-        // Load posts from API
-        const fetchPosts = async () => {
-            try {
-                const res = await fetch('/api/posts')
-                if (res.ok) {
-                    const data = await res.json()
-                    setPosts(data.posts.map((p: any) => ({
-                        id: p.id,
-                        authorId: p.author_email,
-                        authorName: p.author_name,
-                        authorUni: p.author_university || '',
-                        authorNationality: p.author_nationality || 'korean',
-                        title: p.title,
-                        content: p.content,
-                        category: p.category,
-                        createdAt: p.created_at?.split('T')[0] || '',
-                        likes: 0,
-                        comments: 0
-                    })))
-                } else {
-                    // Fallback to sample posts
-                    setPosts(SAMPLE_POSTS)
-                }
-            } catch {
+    const [nextCursor, setNextCursor] = useState<string | null>(null)
+    // The tab whose pages are loaded; a late response for another tab is dropped
+    const categoryRef = useRef(activeCategory)
+
+    const toPost = (p: any): Post => ({
+        id: p.id,
+        authorId: p.author_email,
+        authorName: p.author_name,
+        authorUni: p.author_university || '',
+        authorNationality: p.author_nationality || 'korean',
+        title: p.title,
+        content: p.content,
+        category: p.category,
+        createdAt: p.created_at?.split('T')[0] || '',
+        likes: 0,
+        comments: 0
+    })
+
+    // Load posts from API, one keyset page at a time, filtered by the server
+    const fetchPosts = async (cursor: string | null = null) => {
+        const category = categoryRef.current
+        try {
+            const params = new URLSearchParams({ limit: String(POSTS_PAGE_SIZE) })
+            if (category !== 'all') params.set('category', category)
+            if (cursor) params.set('cursor', cursor)
+            const res = await fetch(`/api/posts?${params}`)
+            if (res.ok) {
+                const data = await res.json()
+                if (category !== categoryRef.current) return
+                const page: Post[] = data.posts.map(toPost)
+                setPosts(prev => cursor ? [...prev, ...page] : page)
+                setNextCursor(data.next_cursor)
+            } else if (!cursor) {
+                // Fallback to sample posts
                 setPosts(SAMPLE_POSTS)
             }
+        } catch {
+            if (!cursor) setPosts(SAMPLE_POSTS)
         }
+    }
+
+    // Switching tabs starts over from the first page of that category
+    useEffect(() => {
+        categoryRef.current = activeCategory
+        setPosts([])
+        setNextCursor(null)
         fetchPosts()
+    }, [activeCategory])
+
+    // Live updates pushed by the server instead of re-fetching the list.
+    // EventSource reconnects by itself and resumes with Last-Event-ID.
+    useEffect(() => {
+        const source = new EventSource('/api/posts/stream')
+        source.addEventListener('post_created', (e) => {
+            const post = toPost(JSON.parse((e as MessageEvent).data))
+            setPosts(prev => prev.some(p => p.id === post.id) ? prev : [post, ...prev])
+        })
+        source.addEventListener('post_deleted', (e) => {
+            const { id } = JSON.parse((e as MessageEvent).data)
+            setPosts(prev => prev.filter(p => p.id !== id))
+        })
+        // Missed more than the server keeps: start over from the first page
+        source.addEventListener('reset', () => fetchPosts())
+        return () => source.close()
     }, [])
 
     const categories: { key: PostCategory | 'all'; label: string; labelKo: string; emoji: string }[] = [
@@ -126,6 +164,7 @@ function CommunityPage({ onBack, isKorean }: CommunityPageProps) {
         { key: 'tips', label: 'Tips', labelKo: '꿀팁공유', emoji: '💡' },
     ]
 
+    // Pages come filtered; this only drops live/new posts of other categories
     const filteredPosts = activeCategory === 'all'
         ? posts
         : posts.filter(p => p.category === activeCategory)
@@ -149,20 +188,9 @@ function CommunityPage({ onBack, isKorean }: CommunityPageProps) {
             })
 
             if (res.ok) {
-                const newPost = await res.json()
-                setPosts([{
-                    id: newPost.id,
-                    authorId: newPost.author_email,
-                    authorName: newPost.author_name,
-                    authorUni: newPost.author_university || '',
-                    authorNationality: newPost.author_nationality || 'korean',
-                    title: newPost.title,
-                    content: newPost.content,
-                    category: newPost.category,
-                    createdAt: newPost.created_at?.split('T')[0] || '',
-                    likes: 0,
-                    comments: 0
-                }, ...posts])
+                // The live feed may have delivered it already
+                const newPost = toPost(await res.json())
+                setPosts(prev => prev.some(p => p.id === newPost.id) ? prev : [newPost, ...prev])
             }
         } catch (err) {
             console.error('Failed to create post', err)
@@ -295,6 +323,15 @@ function CommunityPage({ onBack, isKorean }: CommunityPageProps) {
                                 </article>
                             ))
                         )}
+
+                        {nextCursor && (
+                            <button
+                                className="btn btn-secondary load-more-btn"
+                                onClick={() => fetchPosts(nextCursor)}
+                            >
+                                {isKorean ? '더 보기' : 'Load more'}
+                            </button>
+                        )}
                     </div>
                 </div>
             </main>
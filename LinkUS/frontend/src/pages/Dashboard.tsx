@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react'
-import { useAuth } from '../context/AuthContext'
+import { avatarUrl, useAuth } from '../context/AuthContext'
 import type { Nationality } from '../App'
 import DetailModal from '../components/DetailModal'
 
@@ -14,16 +14,13 @@ interface DashboardProps {
 interface EventItem {
     id: number
     title: string
-    title_ko: string
     type: string
     category: string
     date: string
     location: string
-    location_ko: string
     description: string
-    description_ko: string
-    forForeigners: boolean
-    forKoreans: boolean
+    forForeigners?: boolean
+    forKoreans?: boolean
     image: string
     organizer: string
 }
@@ -31,19 +28,15 @@ interface EventItem {
 interface JobItem {
     id: number
     title: string
-    title_ko: string
     company: string
-    company_ko: string
     location: string
-    location_ko: string
     type: string
     duration: string
     salary: string
     description: string
-    description_ko: string
     requirements: string[]
-    forForeigners: boolean
-    forKoreans: boolean
+    forForeigners?: boolean
+    forKoreans?: boolean
     visaSponsorship: boolean
     image: string
     deadline: string
@@ -51,6 +44,11 @@ interface JobItem {
 
 type TabType = 'all' | 'events' | 'jobs' | 'volunteer'
 
+const CATALOG_FIELDS = [
+    'title', 'type', 'category', 'date', 'location', 'description', 'image', 'organizer',
+    'company', 'duration', 'salary', 'deadline', 'requirements', 'visaSponsorship'
+].join(',')
+
 function Dashboard({ nationality, onBack, onNavigate }: DashboardProps) {
     const { isAuthenticated, user } = useAuth()
     const [activeTab, setActiveTab] = useState<TabType>('all')
@@ -69,8 +67,19 @@ function Dashboard({ nationality, onBack, onNavigate }: DashboardProps) {
         const fetchData = async () => {
             setLoading(true)
             try {
-                const query = nationality ? `?nationality=${nationality}` : ''
-                const response = await fetch(`/api/all${query}`)
+                // One language and only the columns the cards and the modal use
+                const params = new URLSearchParams({ lang: isKorean ? 'ko' : 'en', fields: CATALOG_FIELDS })
+                if (nationality) params.set('nationality', nationality)
+                // Logged in: ranked for the user's major, university and year
+                const token = localStorage.getItem('linkus_access_token')
+                let response = isAuthenticated && token
+                    ? await fetch(`/api/all/personalized?${params}`, {
+                        headers: { 'Authorization': `Bearer ${token}` }
+                    })
+                    : null
+                if (!response?.ok) {
+                    response = await fetch(`/api/all?${params}`)
+                }
 
                 if (response.ok) {
                     const data = await response.json()
@@ -87,7 +96,7 @@ function Dashboard({ nationality, onBack, onNavigate }: DashboardProps) {
         }
 
         fetchData()
-    }, [nationality])
+    }, [nationality, isAuthenticated, user])
 
     const getTagClass = (type: string) => {
         switch (type) {
@@ -130,7 +139,7 @@ function Dashboard({ nationality, onBack, onNavigate }: DashboardProps) {
                                 className="nav-btn nav-profile"
                                 onClick={() => onNavigate('profile')}
                             >
-                                <img src={user?.profileImage} alt="" className="nav-avatar" />
+                                <img src={avatarUrl(user?.profileImage)} alt="" className="nav-avatar" />
                                 {user?.name}
                             </button>
                         ) : (
@@ -219,14 +228,14 @@ function Dashboard({ nationality, onBack, onNavigate }: DashboardProps) {
                                                     <span className="tag tag-event">{event.category}</span>
                                                 </div>
                                                 <h3 className="card-title">
-                                                    {isKorean ? event.title_ko : event.title}
+                                                    {event.title}
                                                 </h3>
                                                 <div className="card-meta">
-                                                    <span>📍 {isKorean ? event.location_ko : event.location}</span>
+                                                    <span>📍 {event.location}</span>
                                                     <span>📅 {event.date}</span>
                                                 </div>
                                                 <p className="card-description">
-                                                    {isKorean ? event.description_ko : event.description}
+                                                    {event.description}
                                                 </p>
                                                 <div className="card-footer">
                                                     <span className="card-organizer">{event.organizer}</span>
@@ -273,16 +282,16 @@ function Dashboard({ nationality, onBack, onNavigate }: DashboardProps) {
                                                     )}
                                                 </div>
                                                 <h3 className="card-title">
-                                                    {isKorean ? job.title_ko : job.title}
+                                                    {job.title}
                                                 </h3>
                                                 <div className="card-meta">
-                                                    <span>🏢 {isKorean ? job.company_ko : job.company}</span>
-                                                    <span>📍 {isKorean ? job.location_ko : job.location}</span>
+                                                    <span>🏢 {job.company}</span>
+                                                    <span>📍 {job.location}</span>
                                                     <span>💰 {job.salary}</span>
                                                     <span>⏱️ {job.duration}</span>
                                                 </div>
                                                 <p className="card-description">
-                                                    {isKorean ? job.description_ko : job.description}
+                                                    {job.description}
                                                 </p>
                                                 <div className="card-footer">
                                                     <span className="card-organizer">
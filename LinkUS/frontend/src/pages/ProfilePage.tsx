@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import { useAuth } from '../context/AuthContext'
+import { avatarUrl, useAuth } from '../context/AuthContext'
 
 interface ProfilePageProps {
     onBack: () => void
@@ -41,7 +41,7 @@ function ProfilePage({ onBack, isKorean }: ProfilePageProps) {
                 <div className="profile-container animate-fade-in">
                     <div className="profile-header glass-card">
                         <div className="profile-avatar">
-                            <img src={user.profileImage} alt={user.name} />
+                            <img src={avatarUrl(user.profileImage)} alt={user.name} />
                             <span className="profile-nationality">
                                 {user.nationality === 'korean' ? '🇰🇷' : '🌍'}
                             </span>
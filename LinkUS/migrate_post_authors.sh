@@ -0,0 +1,22 @@
+#!/bin/bash
+
+# ==========================================
+# Normalize Post Authors (author_id -> users.id)
+# ==========================================
+
+echo "Linking posts to users by id..."
+
+# Posts used to copy the author's name/university/nationality; they now
+# reference users.id and the profile fields are joined in per page.
+# Migration 0003 (migrations.py) adds and backfills author_id and drops the
+# copied columns. Posts whose author no longer exists keep a NULL author_id.
+cd "$(dirname "$0")/backend"
+./venv/bin/python migrations.py upgrade
+
+# Restart backend
+echo "Restarting backend..."
+sudo systemctl restart linkus
+
+echo "=========================================="
+echo "Post authors normalized!"
+echo "=========================================="
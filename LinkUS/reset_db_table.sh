@@ -6,10 +6,27 @@
 
 echo "Resetting 'users' table in MySQL..."
 
-# Drop the table so SQLAlchemy can recreate it with correct Schema
-sudo mysql -e "USE linkus; DROP TABLE IF EXISTS users;"
+# posts.author_id references users.id (fk_posts_author_id, migration 0003),
+# so the key goes first and the posts are detached from the dropped users.
+# Forgetting 0001 and 0003 makes the upgrade recreate the table with the
+# current schema and put the key back.
+sudo mysql <<'SQL'
+USE linkus;
+SET @fk = (SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS
+           WHERE CONSTRAINT_SCHEMA = 'linkus' AND TABLE_NAME = 'posts'
+             AND CONSTRAINT_NAME = 'fk_posts_author_id' AND CONSTRAINT_TYPE = 'FOREIGN KEY');
+SET @drop_fk = IF(@fk > 0, 'ALTER TABLE posts DROP FOREIGN KEY fk_posts_author_id', 'DO 0');
+PREPARE drop_fk FROM @drop_fk;
+EXECUTE drop_fk;
+DEALLOCATE PREPARE drop_fk;
+UPDATE posts SET author_id = NULL;
+DROP TABLE IF EXISTS users;
+DELETE FROM schema_migrations WHERE version IN (1, 3);
+SQL
+cd "$(dirname "$0")/backend"
+./venv/bin/python migrations.py upgrade
 
-# Restart Backend to trigger create_all()
+# Restart backend
 echo "Restarting backend..."
 sudo systemctl restart linkus
 